@@ -1,62 +1,119 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
+
+import anyio.to_thread
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from backend.src.config.settings import (
     CORS_ORIGINS,
     CORS_ALLOW_CREDENTIALS,
     CORS_ALLOW_METHODS,
     CORS_ALLOW_HEADERS,
+    CORS_MAX_AGE,
+    API_THREADPOOL_SIZE,
+    SESSION_TIMEOUT_MINUTES,
 )
+from backend.src.api.middleware.logging import LoggingMiddleware
+from backend.src.api.middleware.validation import RequestSizeLimitMiddleware
+from backend.src.api.routes import filters, detection
+from backend.src.models.yolo_detector import get_detector
 from backend.src.utils.logging_config import setup_logging, logger
 
 setup_logging()
 
+
+async def periodic_cleanup():
+    # Stores only expire entries when touched; sweep them so space is
+    # released even when no requests come in
+    while True:
+        await asyncio.sleep(SESSION_TIMEOUT_MINUTES * 60 / 4)
+        await run_in_threadpool(filters.IMAGE_STORAGE.expire)
+        await run_in_threadpool(filters.RESULT_STORAGE.expire)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Size the threadpool used by run_in_threadpool for blocking image work
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = API_THREADPOOL_SIZE
+
+    # Load the detection model before the first request instead of lazily
+    try:
+        get_detector().load_model()
+    except Exception as e:
+        logger.warning(f"Detection model warm-up skipped: {str(e)}")
+
+    app.state.cleanup_task = asyncio.create_task(periodic_cleanup())
+
+    logger.info("Application startup complete")
+    yield
+    logger.info("Application shutting down")
+
+    app.state.cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.cleanup_task
+    filters.FILTER_POOL.shutdown(wait=False, cancel_futures=True)
+    get_detector().stop_keepalive()
+
+    # Flush records still queued for the background log writer
+    await logger.complete()
+
+
 app = FastAPI(
     title="Chest X-Ray Abnormality Detection API",
     description="Backend API for image filter processing and disease detection",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Innermost, so oversized-request rejections still get CORS headers and logging
+app.add_middleware(RequestSizeLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS,
     allow_credentials=CORS_ALLOW_CREDENTIALS,
     allow_methods=CORS_ALLOW_METHODS,
     allow_headers=CORS_ALLOW_HEADERS,
+    max_age=CORS_MAX_AGE,
 )
+app.add_middleware(LoggingMiddleware)
 
 logger.info("FastAPI application initialized")
 logger.info(f"CORS enabled for origins: {CORS_ORIGINS}")
 
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Application startup complete")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Application shutting down")
-
-
-@app.get("/")
-async def root():
-    return {
+# Static payload serialized once at import time
+_ROOT_JSON_BYTES = orjson.dumps(
+    {
         "message": "Chest X-Ray Abnormality Detection API",
         "version": "1.0.0",
         "status": "running",
     }
+)
 
 
-@app.get("/health")
-async def health_check():
-    from datetime import datetime
+@app.get("/")
+async def root():
+    return Response(content=_ROOT_JSON_BYTES, media_type="application/json")
 
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat() + "Z"}
 
+@app.get("/health")
+async def health_check():
+    content = orjson.dumps(
+        {
+            "status": "healthy",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+    )
+    return Response(content=content, media_type="application/json")
 
-from backend.src.api.routes import filters, detection
 
 app.include_router(filters.router, tags=["Image Filters"])
 logger.info("Registered filters router")
@@ -65,12 +122,21 @@ app.include_router(detection.router, tags=["Disease Detection"])
 logger.info("Registered detection router")
 
 
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request, exc):
+    # Same body as FastAPI's default handler, serialized with orjson as well
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    logger.error(f"Unhandled exception: {str(exc)}")
-    logger.exception(exc)
+    logger.exception("Unhandled exception: {}", exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -81,7 +147,15 @@ async def global_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
-    from backend.src.config.settings import API_HOST, API_PORT, API_RELOAD
+    from backend.src.config.settings import (
+        API_HOST,
+        API_PORT,
+        API_RELOAD,
+        API_LOOP,
+        API_HTTP,
+        API_LIMIT_CONCURRENCY,
+        API_BACKLOG,
+    )
 
     logger.info(f"Starting server on {API_HOST}:{API_PORT}")
     uvicorn.run(
@@ -89,4 +163,8 @@ if __name__ == "__main__":
         host=API_HOST,
         port=API_PORT,
         reload=API_RELOAD,
+        loop=API_LOOP,
+        http=API_HTTP,
+        limit_concurrency=API_LIMIT_CONCURRENCY,
+        backlog=API_BACKLOG,
     )
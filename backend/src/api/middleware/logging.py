@@ -1,85 +1,145 @@
 import time
-from typing import Callable
 from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from backend.src.utils.logging_config import logger
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+# Liveness/monitoring probes that would otherwise flood the access log
+_SILENT_PATHS = frozenset({"/", "/health", "/detect/health"})
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Record start time
-        start_time = time.time()
+# Records bound with access=True are also written to the JSON access log;
+# keyword arguments become structured fields in record["extra"]
+access_logger = logger.bind(access=True)
 
-        # Extract request details
-        method = request.method
-        path = request.url.path
-        client_host = request.client.host if request.client else "unknown"
+
+class LoggingMiddleware:
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _SILENT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        # Record start time (monotonic, nanosecond resolution)
+        start_ns = time.perf_counter_ns()
+
+        # Extract request details straight from the ASGI scope
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
 
         # Log request
-        logger.info(f"→ {method} {path} from {client_host}")
+        access_logger.info(
+            "→ {method} {path} from {client}",
+            method=method,
+            path=path,
+            client=client_host,
+        )
+
+        # Log request body size if present (single lookup, parsed only at DEBUG)
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None:
+            logger.opt(lazy=True).debug(
+                "  Request body size: {:.2f}KB", lambda: int(content_length) / 1024
+            )
+
+        status_code = 500
+        processing_time_ms = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, processing_time_ms
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
 
-        # Log request body size if present
-        if "content-length" in request.headers:
-            content_length = int(request.headers["content-length"])
-            logger.debug(f"  Request body size: {content_length / 1024:.2f}KB")
+                # Calculate processing time up to the first response byte
+                processing_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+                # Add processing time to response headers
+                MutableHeaders(scope=message).append(
+                    "X-Process-Time-Ms", f"{processing_time_ms:.2f}"
+                )
+
+            await send(message)
 
         # Process request
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Log exception
-            processing_time = (time.time() - start_time) * 1000
-            logger.error(
-                f"✗ {method} {path} -> ERROR after {processing_time:.2f}ms: {str(e)}"
+            processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+            access_logger.error(
+                "{method} {path} -> ERROR after {duration_ms:.2f}ms: {error}",
+                method=method,
+                path=path,
+                duration_ms=processing_time,
+                error=str(e),
             )
             raise
 
-        # Calculate processing time
-        processing_time_ms = (time.time() - start_time) * 1000
+        # No response was started (e.g. the client disconnected first)
+        if processing_time_ms is None:
+            processing_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
         # Log response
-        status_code = response.status_code
-        status_emoji = "✓" if status_code < 400 else "✗"
-
-        logger.info(
-            f"{status_emoji} {method} {path} -> {status_code} "
-            f"({processing_time_ms:.2f}ms)"
+        access_logger.info(
+            "{method} {path} -> {status} ({duration_ms:.2f}ms)",
+            method=method,
+            path=path,
+            status=status_code,
+            duration_ms=processing_time_ms,
         )
 
-        # Add processing time to response headers
-        response.headers["X-Process-Time-Ms"] = f"{processing_time_ms:.2f}"
 
-        return response
+def _format_headers(headers: Headers) -> str:
+    # Iterate the header list directly instead of copying it into a dict
+    return ", ".join(f"{key}: {value}" for key, value in headers.items())
 
 
 def log_request_details(request: Request) -> None:
+    # Arguments are only formatted if a DEBUG sink is active; lazy=True defers
+    # the expensive header/client lookups until then as well
+    lazy_logger = logger.opt(lazy=True)
     logger.debug("Request details:")
-    logger.debug(f"  Method: {request.method}")
-    logger.debug(f"  URL: {request.url}")
-    logger.debug(f"  Headers: {dict(request.headers)}")
-    logger.debug(f"  Client: {request.client.host if request.client else 'unknown'}")
+    logger.debug("  Method: {}", request.method)
+    logger.debug("  URL: {}", request.url)
+    lazy_logger.debug("  Headers: {}", lambda: _format_headers(request.headers))
+    lazy_logger.debug(
+        "  Client: {}", lambda: request.client.host if request.client else "unknown"
+    )
 
 
 def log_response_details(response: Response, processing_time_ms: float) -> None:
     logger.debug("Response details:")
-    logger.debug(f"  Status: {response.status_code}")
-    logger.debug(f"  Processing time: {processing_time_ms:.2f}ms")
-    logger.debug(f"  Headers: {dict(response.headers)}")
+    logger.debug("  Status: {}", response.status_code)
+    logger.debug("  Processing time: {:.2f}ms", processing_time_ms)
+    logger.opt(lazy=True).debug(
+        "  Headers: {}", lambda: _format_headers(response.headers)
+    )
 
 
 def log_api_call(
     method: str, endpoint: str, params: dict = None, body: dict = None
 ) -> None:
-    logger.debug(f"API Call: {method} {endpoint}")
+    logger.debug("API Call: {method} {endpoint}", method=method, endpoint=endpoint)
     if params:
-        logger.debug(f"  Params: {params}")
+        logger.debug("  Params: {}", params)
     if body:
-        logger.debug(f"  Body: {body}")
+        logger.debug("  Body: {}", body)
 
 
 def log_api_error(
     method: str, endpoint: str, status_code: int, error_message: str
 ) -> None:
-    logger.error(f"API Error: {method} {endpoint} -> {status_code}: {error_message}")
+    logger.error(
+        "API Error: {method} {endpoint} -> {status}: {error}",
+        method=method,
+        endpoint=endpoint,
+        status=status_code,
+        error=error_message,
+    )
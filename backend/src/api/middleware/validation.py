@@ -1,73 +1,86 @@
 from fastapi import UploadFile, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.src.config.settings import (
+    MAX_FILE_SIZE_MB,
     MAX_FILE_SIZE_BYTES,
-    ALLOWED_IMAGE_FORMATS,
-    ALLOWED_MIME_TYPES,
+    MAX_REQUEST_SIZE_BYTES,
+    UPLOAD_CHUNK_SIZE_BYTES,
     ERROR_FILE_TOO_LARGE,
-    ERROR_INVALID_FORMAT,
-    ERROR_CORRUPTED_IMAGE,
 )
-from backend.src.utils.logging_config import logger, log_validation_error
-from backend.src.utils.image_utils import (
-    load_image_from_bytes,
-    validate_image_dimensions,
-)
-
-
-async def validate_uploaded_file(file: UploadFile) -> bytes:
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
-
-    # Validate file size
-    if file_size > MAX_FILE_SIZE_BYTES:
-        log_validation_error("file_size", f"File too large: {file_size} bytes")
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=ERROR_FILE_TOO_LARGE,
-        )
+from backend.src.utils.logging_config import log_validation_error
 
-    # Validate MIME type
-    if file.content_type not in ALLOWED_MIME_TYPES:
-        log_validation_error("content_type", f"Invalid MIME type: {file.content_type}")
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=ERROR_INVALID_FORMAT,
-        )
 
-    # Validate file can be opened and is not corrupted
-    try:
-        image = load_image_from_bytes(content)
-    except ValueError as e:
-        log_validation_error("image_integrity", str(e))
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_CORRUPTED_IMAGE
-        )
-
-    # Validate image format
-    if image.format not in ALLOWED_IMAGE_FORMATS:
-        log_validation_error("image_format", f"Invalid format: {image.format}")
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=ERROR_INVALID_FORMAT,
-        )
-
-    # Validate image dimensions
-    try:
-        validate_image_dimensions(image)
-    except ValueError as e:
-        log_validation_error("image_dimensions", str(e))
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+FILE_TOO_LARGE_MESSAGE_VI = (
+    f"Kích thước tệp vượt quá giới hạn tối đa. "
+    f"Vui lòng tải lên tệp nhỏ hơn {MAX_FILE_SIZE_MB}MB."
+)
 
-    logger.info(
-        f"File validation passed: {file.filename}, "
-        f"size: {file_size / 1024:.2f}KB, "
-        f"format: {image.format}, "
-        f"dimensions: {image.size[0]}x{image.size[1]}"
-    )
 
-    return content
+class RequestSizeLimitMiddleware:
+    """
+    Rejects requests whose declared Content-Length exceeds MAX_REQUEST_SIZE_BYTES.
+
+    Runs before routing, so an oversized upload is answered with 413 before
+    FastAPI parses (and spools) the multipart body. Bodies without a
+    Content-Length are still bounded by `read_bounded` in the upload route.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            content_length = Headers(scope=scope).get("content-length")
+            if (
+                content_length is not None
+                and content_length.isdigit()
+                and int(content_length) > MAX_REQUEST_SIZE_BYTES
+            ):
+                log_validation_error(
+                    "file_size", f"Request too large: {content_length} bytes (Content-Length)"
+                )
+                response = ORJSONResponse(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    content={
+                        "detail": {
+                            "error": "FILE_TOO_LARGE",
+                            "message": FILE_TOO_LARGE_MESSAGE_VI,
+                            "details": {
+                                "size_bytes": int(content_length),
+                                "max_bytes": MAX_REQUEST_SIZE_BYTES,
+                            },
+                        }
+                    },
+                    # The body is left unread, so the connection can't be reused
+                    headers={"Connection": "close"},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+async def _iter_chunks(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE_BYTES):
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def read_bounded(file: UploadFile, limit: int = MAX_FILE_SIZE_BYTES) -> bytes:
+    # Read in chunks, stopping as soon as the size limit is exceeded so
+    # oversized uploads are never buffered whole
+    buffer = bytearray()
+    async for chunk in _iter_chunks(file):
+        buffer.extend(chunk)
+        if len(buffer) > limit:
+            raise ValueError(f"{ERROR_FILE_TOO_LARGE} (read more than {limit} bytes)")
+
+    return bytes(buffer)
 
 
 def validate_filter_name(filter_name: str, available_filters: list) -> None:
@@ -87,8 +100,11 @@ def validate_filter_list(filter_names: list, available_filters: list) -> None:
             detail="Filter list cannot be empty",
         )
 
+    # Build the lookup set once instead of scanning the list per filter
+    available = frozenset(available_filters)
     for filter_name in filter_names:
-        validate_filter_name(filter_name, available_filters)
+        if filter_name not in available:
+            validate_filter_name(filter_name, available_filters)
 
 
 def validate_image_id(image_id: str, stored_images: dict) -> None:
@@ -1,28 +1,64 @@
+import base64
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from fastapi import APIRouter, HTTPException, status
+import numpy as np
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
-from backend.src.models.yolo_detector import get_detector
-from backend.src.utils.image_utils import numpy_to_base64
-from backend.src.api.routes.filters import IMAGE_STORAGE
+from backend.src.models.yolo_detector import YOLODetector, get_detector
+from backend.src.utils.batching import MicroBatcher
+from backend.src.utils.image_utils import numpy_to_bytes
+from backend.src.api.routes.filters import IMAGE_STORAGE, get_result, new_id, store_result
 from backend.src.config.settings import (
     PERFORMANCE_TARGET_DETECTION,
+    PERFORMANCE_TARGET_DETECTION_ENGINE,
+    YOLO_MAX_BATCH_SIZE,
+    DETECTION_BATCH_WINDOW_MS,
 )
 
 
 router = APIRouter(tags=["detection"])
 
 
+def _detect_batch(images: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+    # One forward pass for all images coalesced by the batcher; preprocessing
+    # (equalize, letterbox) also runs here, off the event loop
+    detector = get_detector()
+    if not detector.model_loaded:
+        detector.load_model()
+
+    return detector.predict_batch(images)
+
+
+# Concurrent detection requests share one batched inference call
+DETECTION_BATCHER = MicroBatcher(
+    _detect_batch, max_batch_size=YOLO_MAX_BATCH_SIZE, window_ms=DETECTION_BATCH_WINDOW_MS
+)
+
+
+def _annotate_and_encode(
+    detector: YOLODetector, image: np.ndarray, detections: List[Dict[str, Any]]
+) -> tuple:
+    # The annotated image lives in a per-thread buffer, so it is encoded on
+    # the same worker thread that drew it (JPEG is plenty for display)
+    annotated_image, detections, is_normal = detector.annotate(image, detections)
+    return numpy_to_bytes(annotated_image, format="JPEG"), detections, is_normal
+
+
 class DetectionRequest(BaseModel):
 
-    image_id: str = Field(..., description="UUID of uploaded image")
+    image_id: str = Field(..., min_length=1, description="ID of uploaded image")
     draw_low_confidence: bool = Field(
         default=False,
         description="Whether to draw low confidence (<40%) bounding boxes",
     )
+    include_base64: bool = Field(
+        default=False, description="Also embed the base64-encoded image in the response"
+    )
 
 
 class BoundingBox(BaseModel):
@@ -48,9 +84,13 @@ class Detection(BaseModel):
 class DetectionResponse(BaseModel):
 
     success: bool
+    request_id: str = Field(description="Unique request identifier")
     is_normal: bool = Field(description="True if no abnormalities detected (T049)")
     detections: List[Detection] = Field(default_factory=list)
-    annotated_image: str = Field(description="Base64-encoded annotated image")
+    annotated_image_url: str = Field(description="URL of the annotated JPEG image")
+    annotated_image: Optional[str] = Field(
+        default=None, description="Base64-encoded annotated image (only if requested)"
+    )
     processing_time_ms: int
     num_detections: int
 
@@ -72,11 +112,12 @@ class ErrorResponse(BaseModel):
 )
 async def analyze_image(request: DetectionRequest):
     logger.info(f"[DETECTION] Analyzing image: {request.image_id}")
-    start_time = time.time()
+    start_time_ns = time.perf_counter_ns()
 
     try:
         # Retrieve image from storage
-        if request.image_id not in IMAGE_STORAGE:
+        image_data = await run_in_threadpool(IMAGE_STORAGE.get, request.image_id)
+        if image_data is None:
             logger.warning(f"[DETECTION] Invalid image ID: {request.image_id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -87,7 +128,6 @@ async def analyze_image(request: DetectionRequest):
                 },
             )
 
-        image_data = IMAGE_STORAGE[request.image_id]
         numpy_image = image_data["image_array"]
         logger.info(
             f"[DETECTION] Retrieved image from storage: "
@@ -97,10 +137,12 @@ async def analyze_image(request: DetectionRequest):
         # Get YOLO detector instance
         detector = get_detector()
 
-        # Run detection pipeline
+        # Run detection pipeline; inference is batched with concurrent
+        # requests, drawing and encoding run off the event loop
         try:
-            annotated_image, detections, is_normal = detector.detect_and_annotate(
-                numpy_image
+            detections = await DETECTION_BATCHER.submit(numpy_image)
+            annotated_bytes, detections, is_normal = await run_in_threadpool(
+                _annotate_and_encode, detector, numpy_image, detections
             )
         except Exception as detection_error:
             logger.error(f"[DETECTION] Detection failed: {str(detection_error)}")
@@ -114,43 +156,57 @@ async def analyze_image(request: DetectionRequest):
                 },
             )
 
-        # Convert annotated image to base64
-        annotated_base64 = numpy_to_base64(annotated_image)
+        # Store the encoded image for the image endpoint
+        request_id = new_id()
+        await run_in_threadpool(
+            store_result, f"detect/{request_id}", annotated_bytes, "image/jpeg"
+        )
 
         # Calculate processing time
-        end_time = time.time()
-        processing_time_ms = int((end_time - start_time) * 1000)
+        processing_time_ms = (time.perf_counter_ns() - start_time_ns) // 1_000_000
+
+        # Log performance (T047) - tighter target when running the TensorRT engine
+        if detector.model_path.suffix == ".engine":
+            target_ms = int(PERFORMANCE_TARGET_DETECTION_ENGINE * 1000)
+        else:
+            target_ms = int(PERFORMANCE_TARGET_DETECTION * 1000)
 
-        # Log performance (T047)
         logger.info(
             f"[DETECTION] Complete - {len(detections)} detections in {processing_time_ms}ms "
-            f"(target: {int(PERFORMANCE_TARGET_DETECTION * 1000)}ms)"
+            f"(target: {target_ms}ms)"
         )
 
-        if processing_time_ms > PERFORMANCE_TARGET_DETECTION * 1000:
+        if processing_time_ms > target_ms:
             logger.warning(
                 f"[DETECTION] Performance target exceeded: {processing_time_ms}ms > "
-                f"{int(PERFORMANCE_TARGET_DETECTION * 1000)}ms"
+                f"{target_ms}ms"
             )
 
-        # Build response
-        response = DetectionResponse(
+        # Build response. Detections come from our own detector, so skip
+        # validation with model_construct
+        response = DetectionResponse.model_construct(
             success=True,
+            request_id=request_id,
             is_normal=is_normal,
             detections=[
-                Detection(
+                Detection.model_construct(
                     class_id=det["class_id"],
                     class_name_en=det["class_name_en"],
                     class_name_vi=det["class_name_vi"],
                     confidence=det["confidence"],
                     confidence_tier=det["confidence_tier"],
-                    bbox=BoundingBox(**det["bbox"]),
+                    bbox=BoundingBox.model_construct(**det["bbox"]),
                     health_description=det["health_description"],
                     health_warning=det["health_warning"],
                 )
                 for det in detections
             ],
-            annotated_image=annotated_base64,
+            annotated_image_url=f"/detect/result/{request_id}/image",
+            annotated_image=(
+                base64.b64encode(annotated_bytes).decode("ascii")
+                if request.include_base64
+                else None
+            ),
             processing_time_ms=processing_time_ms,
             num_detections=len(detections),
         )
@@ -166,7 +222,8 @@ async def analyze_image(request: DetectionRequest):
                     f"{det['confidence']:.1%} [{det['confidence_tier']}]"
                 )
 
-        return response
+        # Returning a Response bypasses FastAPI's response_model re-validation
+        return ORJSONResponse(response.model_dump())
 
     except HTTPException:
         raise
@@ -185,6 +242,24 @@ async def analyze_image(request: DetectionRequest):
         )
 
 
+@router.get("/detect/result/{request_id}/image")
+async def get_annotated_image(request_id: str):
+    result = await run_in_threadpool(get_result, f"detect/{request_id}")
+    if result is None:
+        logger.warning(f"[DETECTION] Result not found: {request_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": "Kết quả phân tích không tồn tại hoặc đã hết hạn. Vui lòng phân tích lại.",
+                "error_code": "RESULT_NOT_FOUND",
+            },
+        )
+
+    image_bytes, media_type = result
+    return Response(content=image_bytes, media_type=media_type)
+
+
 @router.get("/detect/health")
 async def health_check():
     detector = get_detector()
@@ -194,6 +269,7 @@ async def health_check():
         "service": "detection",
         "model_loaded": detector.model_loaded,
         "model_path": str(detector.model_path),
+        "device": detector.device,
         "confidence_threshold": detector.confidence_threshold,
     }
 
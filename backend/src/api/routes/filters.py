@@ -1,35 +1,90 @@
-import uuid
+import asyncio
+import base64
+import secrets
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Literal, Optional, Tuple
 from io import BytesIO
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, status
+import numpy as np
+from fastapi import APIRouter, File, UploadFile, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from loguru import logger
+from starlette.concurrency import run_in_threadpool
 
 from backend.src.config.settings import (
     MAX_FILE_SIZE_BYTES,
     ALLOWED_IMAGE_FORMATS,
     SESSION_TIMEOUT_MINUTES,
+    IMAGE_STORAGE_MAX_ITEMS,
+    IMAGE_STORAGE_PATH,
+    RESULT_STORAGE_MAX_ITEMS,
+    RESULT_STORAGE_PATH,
+    FILTER_DISPLAY_MAX_SIDE,
 )
 from backend.src.utils.image_utils import (
     load_image_from_bytes,
+    decode_grayscale,
     validate_image_dimensions,
-    pil_to_numpy,
-    numpy_to_base64,
+    numpy_to_bytes,
+    downscale_to_max_side,
     get_image_info,
 )
-from backend.src.filters import get_filter_list, apply_filter
+from backend.src.utils.storage import SharedImageStore
+from backend.src.api.middleware.validation import FILE_TOO_LARGE_MESSAGE_VI, read_bounded
+from backend.src.filters import FILTER_POOL, get_filter_list, apply_filter
 
 router = APIRouter()
 
-IMAGE_STORAGE: Dict[str, dict] = {}
+
+def new_id() -> str:
+    # 128 random bits, URL-safe, from a single urandom call
+    return secrets.token_urlsafe(16)
+
+
+# Filter metadata is static, so build the lookups once at import time
+_FILTER_LIST = get_filter_list()
+_FILTER_BY_ID = {f["id"]: f for f in _FILTER_LIST}
+_FILTER_IDS = frozenset(_FILTER_BY_ID)
+
+# Uploaded images expire after SESSION_TIMEOUT_MINUTES without access. They
+# are kept in SQLite so every uvicorn worker sees the same uploads. Store
+# calls block (queries and copies), so routes make them off the event loop
+IMAGE_STORAGE = SharedImageStore(
+    db_path=IMAGE_STORAGE_PATH,
+    maxsize=IMAGE_STORAGE_MAX_ITEMS,
+    ttl=SESSION_TIMEOUT_MINUTES * 60,
+)
+
+# Encoded result images, served by the result endpoints. Shared like the
+# uploads, since the follow-up GET may reach a different worker
+RESULT_STORAGE = SharedImageStore(
+    db_path=RESULT_STORAGE_PATH,
+    maxsize=RESULT_STORAGE_MAX_ITEMS,
+    ttl=SESSION_TIMEOUT_MINUTES * 60,
+)
+
+
+def store_result(key: str, image_bytes: bytes, media_type: str) -> None:
+    RESULT_STORAGE[key] = {
+        "data": np.frombuffer(image_bytes, dtype=np.uint8),
+        "media_type": media_type,
+    }
+
+
+def get_result(key: str) -> Optional[Tuple[bytes, str]]:
+    # Returns (image_bytes, media_type), or None if missing or expired
+    result = RESULT_STORAGE.get(key)
+    if result is None:
+        return None
+    return result["data"].tobytes(), result["media_type"]
 
 
 # Vietnamese error messages for user-facing errors
 ERROR_MESSAGES_VI = {
-    "FILE_TOO_LARGE": f"Kích thước tệp vượt quá giới hạn tối đa. Vui lòng tải lên tệp nhỏ hơn 10MB.",
+    "FILE_TOO_LARGE": FILE_TOO_LARGE_MESSAGE_VI,
     "INVALID_FORMAT": "Định dạng tệp không hợp lệ. Chỉ chấp nhận các định dạng: PNG, JPG, JPEG.",
     "CORRUPTED_IMAGE": "Tệp hình ảnh bị hỏng hoặc không thể mở. Vui lòng thử tệp khác.",
     "IMAGE_TOO_SMALL": "Kích thước hình ảnh quá nhỏ. Vui lòng tải lên hình ảnh có độ phân giải cao hơn.",
@@ -38,6 +93,7 @@ ERROR_MESSAGES_VI = {
     "FILTER_NOT_FOUND": "Bộ lọc không tồn tại. Vui lòng chọn bộ lọc hợp lệ.",
     "PROCESSING_FAILED": "Xử lý hình ảnh thất bại. Vui lòng thử lại hoặc sử dụng hình ảnh khác.",
     "NO_FILTERS_SELECTED": "Vui lòng chọn ít nhất một bộ lọc để áp dụng.",
+    "RESULT_NOT_FOUND": "Kết quả xử lý không tồn tại hoặc đã hết hạn. Vui lòng xử lý lại hình ảnh.",
     "NETWORK_ERROR": "Lỗi kết nối mạng. Vui lòng kiểm tra kết nối và thử lại.",
 }
 
@@ -71,11 +127,27 @@ class FilterListResponse(BaseModel):
     filters: List[FilterInfo] = Field(..., description="List of available filters")
 
 
+_FILTER_LIST_RESPONSE = FilterListResponse(
+    filters=[FilterInfo(**f) for f in _FILTER_LIST]
+)
+
+
 class FilterApplyRequest(BaseModel):
 
-    image_id: str = Field(..., description="ID of uploaded image")
+    image_id: str = Field(..., min_length=1, description="ID of uploaded image")
     filters: List[str] = Field(
-        ..., min_items=1, description="List of filter IDs to apply"
+        ..., min_length=1, description="List of filter IDs to apply"
+    )
+    include_base64: bool = Field(
+        default=False, description="Also embed base64-encoded images in the response"
+    )
+    display_max_side: Optional[int] = Field(
+        default=FILTER_DISPLAY_MAX_SIDE,
+        ge=1,
+        description="Downscale outputs to this longest side (null for full resolution)",
+    )
+    format: Literal["png", "jpeg"] = Field(
+        default="jpeg", description="Encoding for non-binary outputs"
     )
 
 
@@ -83,7 +155,11 @@ class ProcessedImageInfo(BaseModel):
 
     filter_name: str = Field(..., description="Filter identifier")
     display_name: str = Field(..., description="Filter display name (English)")
-    image_base64: str = Field(..., description="Base64-encoded processed image")
+    image_url: str = Field(..., description="URL of the processed image")
+    media_type: str = Field(..., description="Media type of the processed image")
+    image_base64: Optional[str] = Field(
+        None, description="Base64-encoded processed image (only if requested)"
+    )
     processing_time_ms: int = Field(..., description="Processing time in milliseconds")
 
 
@@ -103,42 +179,55 @@ class ErrorResponse(BaseModel):
     details: Optional[dict] = Field(None, description="Additional error context")
 
 
-def clean_expired_images():
-    now = datetime.now()
-    expired_ids = []
-
-    for image_id, data in IMAGE_STORAGE.items():
-        upload_time = data["upload_time"]
-        if now - upload_time > timedelta(minutes=SESSION_TIMEOUT_MINUTES):
-            expired_ids.append(image_id)
-
-    for image_id in expired_ids:
-        del IMAGE_STORAGE[image_id]
-        logger.info(f"Cleaned up expired image: {image_id}")
-
-    if expired_ids:
-        logger.info(f"Removed {len(expired_ids)} expired images from memory")
+@dataclass
+class _FilterOutcome:
+
+    image_bytes: bytes
+    media_type: str
+    processing_time_ms: int
+
+
+def _run_filter(
+    filter_id: str,
+    image_array,
+    display_max_side: Optional[int],
+    image_format: str,
+) -> _FilterOutcome:
+    # Runs on FILTER_POOL; encoding here keeps the event loop free as well
+    filter_start_time_ns = time.perf_counter_ns()
+    filtered_array = apply_filter(filter_id, image_array)
+    processing_time_ms = (time.perf_counter_ns() - filter_start_time_ns) // 1_000_000
+
+    # Binary masks stay lossless at full resolution (they compress well as PNG);
+    # everything else is encoded at display size
+    if _FILTER_BY_ID[filter_id]["output_type"] == "binary":
+        image_format = "png"
+    elif display_max_side is not None:
+        filtered_array = downscale_to_max_side(filtered_array, display_max_side)
+
+    return _FilterOutcome(
+        image_bytes=numpy_to_bytes(filtered_array, format=image_format.upper()),
+        media_type=f"image/{image_format}",
+        processing_time_ms=processing_time_ms,
+    )
 
 
 @router.post("/upload", response_model=UploadResponse, status_code=status.HTTP_200_OK)
 async def upload_image(file: UploadFile = File(...)):
     logger.info(f"Upload request received: {file.filename} ({file.content_type})")
 
-    # Clean up expired images before processing new upload
-    clean_expired_images()
-
     try:
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-
-        # Validate file size
-        if file_size > MAX_FILE_SIZE_BYTES:
-            logger.warning(
-                f"File too large: {file_size} bytes (max: {MAX_FILE_SIZE_BYTES})"
-            )
+        # Validate file size. Starlette has already spooled the body to a temp
+        # file, so this only avoids copying an oversized upload into memory
+        file_size = file.size
+        try:
+            if file_size is not None and file_size > MAX_FILE_SIZE_BYTES:
+                raise ValueError(f"File too large: {file_size} bytes")
+            file_content = await read_bounded(file, MAX_FILE_SIZE_BYTES)
+        except ValueError as e:
+            logger.warning(f"{str(e)} (max: {MAX_FILE_SIZE_BYTES})")
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail={
                     "error": "FILE_TOO_LARGE",
                     "message": ERROR_MESSAGES_VI["FILE_TOO_LARGE"],
@@ -148,6 +237,7 @@ async def upload_image(file: UploadFile = File(...)):
                     },
                 },
             )
+        file_size = len(file_content)
 
         # Load and validate image
         try:
@@ -183,38 +273,54 @@ async def upload_image(file: UploadFile = File(...)):
                     "message": ERROR_MESSAGES_VI["INVALID_FORMAT"],
                     "details": {
                         "format": image_format,
-                        "allowed": ALLOWED_IMAGE_FORMATS,
+                        "allowed": sorted(ALLOWED_IMAGE_FORMATS),
                     },
                 },
             )
 
-        # Convert to numpy array (grayscale for X-rays)
-        image_array = pil_to_numpy(pil_image, grayscale=True)
+        # Decode to a grayscale numpy array (X-rays). The stored array is
+        # shared by every filter/detection request, so make it read-only
+        try:
+            image_array = await run_in_threadpool(decode_grayscale, file_content)
+        except ValueError as e:
+            logger.error(f"Image decoding failed: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": "CORRUPTED_IMAGE",
+                    "message": ERROR_MESSAGES_VI["CORRUPTED_IMAGE"],
+                    "details": {"reason": str(e)},
+                },
+            )
+        image_array.setflags(write=False)
 
         # Get image metadata
         image_info = get_image_info(pil_image)
 
         # Generate unique image ID
-        image_id = str(uuid.uuid4())
-
-        # Store in memory
-        IMAGE_STORAGE[image_id] = {
-            "image_array": image_array,
-            "metadata": {
-                "filename": file.filename,
-                "size_bytes": file_size,
-                "width": image_info["width"],
-                "height": image_info["height"],
-                "format": image_format,
+        image_id = new_id()
+
+        # Store for the filter and detection routes
+        await run_in_threadpool(
+            IMAGE_STORAGE.__setitem__,
+            image_id,
+            {
+                "image_array": image_array,
+                "metadata": {
+                    "filename": file.filename,
+                    "size_bytes": file_size,
+                    "width": image_info["width"],
+                    "height": image_info["height"],
+                    "format": image_format,
+                },
+                "upload_time": datetime.now(),
             },
-            "upload_time": datetime.now(),
-        }
+        )
 
         logger.info(
             f"Image uploaded successfully: {image_id} "
             f"({image_info['width']}x{image_info['height']}, {file_size} bytes)"
         )
-        logger.debug(f"Current in-memory storage: {len(IMAGE_STORAGE)} images")
 
         return UploadResponse(
             image_id=image_id,
@@ -245,14 +351,10 @@ async def upload_image(file: UploadFile = File(...)):
     "/filter/list", response_model=FilterListResponse, status_code=status.HTTP_200_OK
 )
 async def list_filters():
-    logger.info("Filter list request received")
+    logger.debug("Filter list request received")
 
     try:
-        filters = get_filter_list()
-
-        logger.info(f"Returning {len(filters)} available filters")
-
-        return FilterListResponse(filters=[FilterInfo(**f) for f in filters])
+        return _FILTER_LIST_RESPONSE
 
     except Exception as e:
         logger.error(f"Failed to retrieve filter list: {str(e)}")
@@ -276,11 +378,9 @@ async def apply_filters(request: FilterApplyRequest):
         f"filters={request.filters}"
     )
 
-    # Clean up expired images
-    clean_expired_images()
-
-    # Validate image_id exists
-    if request.image_id not in IMAGE_STORAGE:
+    # Validate image_id exists (expired images are evicted by the cache)
+    image_data = await run_in_threadpool(IMAGE_STORAGE.get, request.image_id)
+    if image_data is None:
         logger.warning(f"Invalid or expired image_id: {request.image_id}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -291,19 +391,6 @@ async def apply_filters(request: FilterApplyRequest):
             },
         )
 
-    # Validate filter list is not empty
-    if not request.filters:
-        logger.warning("No filters specified in request")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "NO_FILTERS_SELECTED",
-                "message": ERROR_MESSAGES_VI["NO_FILTERS_SELECTED"],
-            },
-        )
-
-    # Get image from storage
-    image_data = IMAGE_STORAGE[request.image_id]
     image_array = image_data["image_array"]
 
     logger.info(
@@ -311,86 +398,122 @@ async def apply_filters(request: FilterApplyRequest):
         f"({image_data['metadata']['width']}x{image_data['metadata']['height']})"
     )
 
-    # Get available filter IDs for validation
-    available_filters = {f["id"] for f in get_filter_list()}
+    # Generate request ID (result images are stored under it)
+    request_id = new_id()
 
-    # Process each filter
-    results = []
-    total_start_time = time.time()
+    # Deduplicate (keeping request order) so repeated IDs are computed once
+    filter_ids = list(dict.fromkeys(request.filters))
 
-    for filter_id in request.filters:
-        # Validate filter exists
-        if filter_id not in available_filters:
-            logger.warning(f"Invalid filter requested: {filter_id}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error": "FILTER_NOT_FOUND",
-                    "message": ERROR_MESSAGES_VI["FILTER_NOT_FOUND"],
-                    "details": {
-                        "filter": filter_id,
-                        "available": list(available_filters),
-                    },
+    # Reject unknown filters before doing any work
+    if not _FILTER_IDS.issuperset(filter_ids):
+        filter_id = next(f for f in filter_ids if f not in _FILTER_IDS)
+        logger.warning(f"Invalid filter requested: {filter_id}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "FILTER_NOT_FOUND",
+                "message": ERROR_MESSAGES_VI["FILTER_NOT_FOUND"],
+                "details": {
+                    "filter": filter_id,
+                    "available": sorted(_FILTER_IDS),
                 },
-            )
-
-        try:
-            # Apply filter with timing
-            filter_start_time = time.time()
-
-            filtered_array = apply_filter(filter_id, image_array.copy())
-
-            filter_end_time = time.time()
-            processing_time_ms = int((filter_end_time - filter_start_time) * 1000)
-
-            # Convert to base64
-            image_base64 = numpy_to_base64(filtered_array, format="PNG")
-
-            # Get filter display name
-            filter_metadata = next(f for f in get_filter_list() if f["id"] == filter_id)
-
-            results.append(
-                ProcessedImageInfo(
-                    filter_name=filter_id,
-                    display_name=filter_metadata["name"],
-                    image_base64=image_base64,
-                    processing_time_ms=processing_time_ms,
-                )
-            )
+            },
+        )
 
-            logger.info(
-                f"Filter '{filter_id}' applied successfully "
-                f"(processing time: {processing_time_ms}ms)"
+    # Filters are independent, so run them concurrently off the event loop
+    total_start_time_ns = time.perf_counter_ns()
+
+    loop = asyncio.get_running_loop()
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                FILTER_POOL,
+                _run_filter,
+                filter_id,
+                image_array,
+                request.display_max_side,
+                request.format,
             )
+            for filter_id in filter_ids
+        ),
+        return_exceptions=True,
+    )
 
-        except Exception as e:
-            logger.error(f"Filter '{filter_id}' processing failed: {str(e)}")
-            logger.exception(e)
+    results = []
+    for filter_id, outcome in zip(filter_ids, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Filter '{filter_id}' processing failed: {str(outcome)}")
+            logger.exception(outcome)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={
                     "error": "PROCESSING_FAILED",
                     "message": ERROR_MESSAGES_VI["PROCESSING_FAILED"],
-                    "details": {"filter": filter_id, "reason": str(e)},
+                    "details": {"filter": filter_id, "reason": str(outcome)},
                 },
             )
 
-    total_end_time = time.time()
-    total_time_ms = int((total_end_time - total_start_time) * 1000)
+        # Store the encoded image for the binary result endpoint
+        await run_in_threadpool(
+            store_result,
+            f"{request_id}/{filter_id}",
+            outcome.image_bytes,
+            outcome.media_type,
+        )
 
-    # Generate request ID
-    request_id = str(uuid.uuid4())
+        results.append(
+            ProcessedImageInfo.model_construct(
+                filter_name=filter_id,
+                display_name=_FILTER_BY_ID[filter_id]["name"],
+                image_url=f"/filter/result/{request_id}/{filter_id}",
+                media_type=outcome.media_type,
+                image_base64=(
+                    base64.b64encode(outcome.image_bytes).decode("ascii")
+                    if request.include_base64
+                    else None
+                ),
+                processing_time_ms=outcome.processing_time_ms,
+            )
+        )
+
+        logger.debug(
+            "Filter '{}' applied successfully (processing time: {}ms)",
+            filter_id,
+            outcome.processing_time_ms,
+        )
+
+    total_time_ms = (time.perf_counter_ns() - total_start_time_ns) // 1_000_000
 
     logger.info(
         f"All filters applied successfully: {len(results)} filters, "
         f"total time: {total_time_ms}ms"
     )
 
-    return FilterApplyResponse(
+    # Built from trusted values: skip validation here and in response_model
+    response = FilterApplyResponse.model_construct(
         request_id=request_id,
         results=results,
         total_time_ms=total_time_ms,
     )
+    return ORJSONResponse(response.model_dump())
+
+
+@router.get("/filter/result/{request_id}/{filter_id}")
+async def get_filter_result_image(request_id: str, filter_id: str):
+    result = await run_in_threadpool(get_result, f"{request_id}/{filter_id}")
+    if result is None:
+        logger.warning(f"Filter result not found: {request_id}/{filter_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "RESULT_NOT_FOUND",
+                "message": ERROR_MESSAGES_VI["RESULT_NOT_FOUND"],
+                "details": {"request_id": request_id, "filter": filter_id},
+            },
+        )
+
+    image_bytes, media_type = result
+    return Response(content=image_bytes, media_type=media_type)
 
 
 # Export router
@@ -1,3 +1,5 @@
+import os
+import sys
 from pathlib import Path
 
 # Project root directory
@@ -6,6 +8,10 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 # Model paths
 MODEL_DIR = PROJECT_ROOT / "models"
 MODEL_WEIGHTS_PATH = MODEL_DIR / "hard_augmented.pt"
+MODEL_ENGINE_PATH = MODEL_DIR / "hard_augmented.engine"  # TensorRT FP16 export, used if present
+MODEL_TORCHSCRIPT_PATH = MODEL_DIR / "hard_augmented.torchscript"  # TorchScript export, if present
+MODEL_INT8_ENGINE_PATH = MODEL_DIR / "hard_augmented_int8.engine"  # TensorRT INT8 export
+MODEL_OPENVINO_INT8_PATH = MODEL_DIR / "hard_augmented_int8_openvino_model"  # OpenVINO INT8 (CPU)
 
 # Configuration file paths
 CONFIG_DIR = PROJECT_ROOT / "configs"
@@ -15,33 +21,52 @@ HEALTH_INFO_PATH = CONFIG_DIR / "health_info_vi.json"
 # File upload constraints
 MAX_FILE_SIZE_MB = 10
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024  # 10MB = 10,485,760 bytes
-ALLOWED_IMAGE_FORMATS = ["PNG", "JPEG", "JPG"]
-ALLOWED_MIME_TYPES = ["image/png", "image/jpeg", "image/jpg"]
+MAX_REQUEST_SIZE_BYTES = MAX_FILE_SIZE_BYTES + 64 * 1024  # Allow for multipart framing
+UPLOAD_CHUNK_SIZE_BYTES = 64 * 1024  # Read uploads in 64KB chunks
+ALLOWED_IMAGE_FORMATS = frozenset({"PNG", "JPEG", "JPG"})
+ALLOWED_MIME_TYPES = frozenset({"image/png", "image/jpeg", "image/jpg"})
 
 # Image processing constraints
 MAX_IMAGE_DIMENSION = 2048  # Maximum width or height in pixels
 MIN_IMAGE_DIMENSION = 1  # Minimum width or height in pixels
+PNG_COMPRESSION_LEVEL = 1  # Faster encode for a slightly larger payload (0-9)
+JPEG_QUALITY = 85  # Quality for lossy response images (annotated detections, previews)
+FILTER_DISPLAY_MAX_SIDE = 1024  # Default longest side of filter outputs sent for display
 
 # Performance targets (in seconds)
 PERFORMANCE_TARGET_SINGLE_FILTER = 5.0  # Single filter processing target
 PERFORMANCE_TARGET_MULTIPLE_FILTERS = 15.0  # Multiple filters processing target
 PERFORMANCE_TARGET_DETECTION = 10.0  # Disease detection inference target
+PERFORMANCE_TARGET_DETECTION_ENGINE = 2.0  # Detection target with the TensorRT engine
 
 # YOLO model configuration
 YOLO_CONFIDENCE_THRESHOLD = 0.4  # Minimum confidence for detection display
 YOLO_CONFIDENCE_HIGH = 0.7  # High confidence threshold (solid box)
 YOLO_CONFIDENCE_MEDIUM = 0.4  # Medium confidence threshold (dashed box)
-YOLO_INPUT_SIZE = 640  # YOLO model input size
+YOLO_INPUT_SIZE = 1024  # YOLO model input size (matches training imgsz)
+YOLO_ENGINE_WORKSPACE_GB = 4  # TensorRT builder workspace size
+YOLO_WARMUP_ITERATIONS = 2  # Dummy forward passes after loading (CUDA/TensorRT lazy init)
+YOLO_KEEPALIVE_INTERVAL_S = 0  # Opt-in: idle seconds between dummy GPU passes (0 disables)
+YOLO_PRECISION = os.getenv("YOLO_PRECISION", "fp16")  # "int8" prefers the INT8 exports when present
+YOLO_MAX_BATCH_SIZE = 8  # Images per forward pass in batched inference
+DETECTION_BATCH_WINDOW_MS = 5  # How long concurrent detection requests are coalesced
 
 # Confidence tier display rules
 CONFIDENCE_TIER_HIGH = "high"  # >70% - solid bounding box
 CONFIDENCE_TIER_MEDIUM = "medium"  # 40-70% - dashed bounding box
 CONFIDENCE_TIER_LOW = "low"  # <40% - hidden (filtered out)
+LABEL_FONT_SIZE = 48  # Font size for detection labels on annotated images
 
 # API configuration
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 API_RELOAD = True  # Enable auto-reload for development
+API_LOOP = "asyncio" if sys.platform == "win32" else "uvloop"  # uvloop has no Windows build
+API_HTTP = "httptools"  # Faster HTTP/1.1 parser than h11
+API_LIMIT_CONCURRENCY = 100  # Return 503 beyond this many concurrent connections
+API_BACKLOG = 2048  # Maximum number of pending connections
+API_THREADPOOL_SIZE = 40  # Worker threads for blocking work (image decoding)
+FILTER_POOL_MAX_WORKERS = min(8, os.cpu_count() or 1)  # Filters run concurrently
 
 # CORS configuration
 CORS_ORIGINS = [
@@ -49,14 +74,16 @@ CORS_ORIGINS = [
     "http://127.0.0.1:8501",
 ]
 CORS_ALLOW_CREDENTIALS = True
-CORS_ALLOW_METHODS = ["*"]
-CORS_ALLOW_HEADERS = ["*"]
+CORS_ALLOW_METHODS = ["GET", "POST"]  # Only methods used by filters/detection routes
+CORS_ALLOW_HEADERS = ["Content-Type", "Accept"]
+CORS_MAX_AGE = 86400  # Cache preflight responses for 24 hours
 
 # Logging configuration
 LOG_DIR = PROJECT_ROOT / "backend" / "logs"
 LOG_ROTATION = "10 MB"  # Rotate log files at 10MB
 LOG_RETENTION = "7 days"  # Keep logs for 7 days
 LOG_LEVEL = "DEBUG"  # Log level for development
+ACCESS_LOG_FILE = "access_{time:YYYY-MM-DD}.jsonl"  # Structured JSON access log
 LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
 
 # Filter configuration
@@ -120,10 +147,15 @@ FILTER_PARAMETERS = {
 
 # Session management
 SESSION_TIMEOUT_MINUTES = 30  # Clear in-memory data after 30 minutes of inactivity
+IMAGE_STORAGE_MAX_ITEMS = 256  # Least recently used images are evicted beyond this
+RESULT_STORAGE_MAX_ITEMS = 1024  # Encoded filter/detection result images kept for download
+# SQLite databases shared by all workers
+IMAGE_STORAGE_PATH = PROJECT_ROOT / "backend" / "storage" / "images.sqlite3"
+RESULT_STORAGE_PATH = PROJECT_ROOT / "backend" / "storage" / "results.sqlite3"
 
 ERROR_FILE_TOO_LARGE = f"File size exceeds maximum limit of {MAX_FILE_SIZE_MB}MB"
 ERROR_INVALID_FORMAT = (
-    f"Invalid file format. Allowed formats: {', '.join(ALLOWED_IMAGE_FORMATS)}"
+    f"Invalid file format. Allowed formats: {', '.join(sorted(ALLOWED_IMAGE_FORMATS))}"
 )
 ERROR_CORRUPTED_IMAGE = "Image file is corrupted or cannot be opened"
 ERROR_IMAGE_TOO_SMALL = f"Image dimensions too small. Minimum: {MIN_IMAGE_DIMENSION}x{MIN_IMAGE_DIMENSION} pixels"
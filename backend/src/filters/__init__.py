@@ -1,10 +1,13 @@
 """Filter registry - Central module for managing all image processing filters."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Callable, Any
 import numpy as np
 import time
 from loguru import logger
 
+from backend.src.config.settings import FILTER_POOL_MAX_WORKERS
+
 # Import all filter implementations
 from .sobel import apply_sobel
 from .canny import apply_canny
@@ -16,6 +19,13 @@ from .dct import apply_dct
 from .otsu import apply_otsu
 
 
+# Filters are CPU-bound NumPy/OpenCV work that releases the GIL; one
+# long-lived pool per process runs them in parallel
+FILTER_POOL = ThreadPoolExecutor(
+    max_workers=FILTER_POOL_MAX_WORKERS, thread_name_prefix="filter"
+)
+
+
 # Filter metadata registry
 FILTER_REGISTRY: Dict[str, Dict[str, Any]] = {
     "sobel": {
@@ -37,6 +47,7 @@ FILTER_REGISTRY: Dict[str, Dict[str, Any]] = {
             "low_threshold": None,  # None for auto-threshold
             "high_threshold": None,  # None for auto-threshold
             "auto_threshold": True,  # Enable auto-threshold by default
+            "use_opencv": False,  # True for the cv2.Canny fast path
         },
         "output_type": "binary",
     },
@@ -102,32 +113,40 @@ FILTER_REGISTRY: Dict[str, Dict[str, Any]] = {
 }
 
 
+# Public metadata per filter, built once since the registry is static
+_FILTER_LIST = [
+    {
+        "id": filter_id,
+        "name": metadata["name"],
+        "name_vi": metadata["name_vi"],
+        "description": metadata["description"],
+        "description_vi": metadata["description_vi"],
+        "parameters": metadata["parameters"],
+        "output_type": metadata["output_type"],
+    }
+    for filter_id, metadata in FILTER_REGISTRY.items()
+]
+
+
 def get_filter_list() -> list:
     """
     Get list of available filters with metadata.
     
     Returns:
         List of filter dictionaries with name, description, and parameters
+        (a shallow copy of the prebuilt list; treat the dicts as read-only)
     """
-    filters = []
-    for filter_id, metadata in FILTER_REGISTRY.items():
-        filters.append({
-            "id": filter_id,
-            "name": metadata["name"],
-            "name_vi": metadata["name_vi"],
-            "description": metadata["description"],
-            "description_vi": metadata["description_vi"],
-            "parameters": metadata["parameters"],
-            "output_type": metadata["output_type"],
-        })
-    
-    logger.info(f"Filter registry - {len(filters)} filters available")
-    return filters
+    logger.debug("Filter registry - {} filters available", len(_FILTER_LIST))
+    return list(_FILTER_LIST)
 
 
 def apply_filter(filter_id: str, image: np.ndarray, **kwargs) -> np.ndarray:
     """
     Apply a filter to an image by filter ID.
+
+    Filters must not modify `image` in place: callers pass the same stored
+    (read-only) array to every filter. A filter that needs a writable buffer
+    must make its own copy.
     
     Args:
         filter_id: Filter identifier (e.g., 'sobel', 'canny')
@@ -175,16 +194,20 @@ def apply_multiple_filters(filter_ids: list, image: np.ndarray) -> Dict[str, np.
     logger.info(f"Applying {len(filter_ids)} filters: {filter_ids}")
     
     # Start total timing
-    total_start_time = time.time()
+    total_start_time = time.perf_counter()
+    
+    def run_timed(filter_id: str) -> tuple:
+        # Time each filter individually
+        filter_start_time = time.perf_counter()
+        result = apply_filter(filter_id, image)
+        return result, time.perf_counter() - filter_start_time
+    
+    # Filters are independent, so run them on the shared filter pool
+    futures = {fid: FILTER_POOL.submit(run_timed, fid) for fid in filter_ids}
     
-    for filter_id in filter_ids:
+    for filter_id, future in futures.items():
         try:
-            # Time each filter individually
-            filter_start_time = time.time()
-            
-            results[filter_id] = apply_filter(filter_id, image)
-            
-            filter_elapsed_time = time.time() - filter_start_time
+            results[filter_id], filter_elapsed_time = future.result()
             filter_timings[filter_id] = filter_elapsed_time
             
             # Log individual filter completion with timing
@@ -200,7 +223,7 @@ def apply_multiple_filters(filter_ids: list, image: np.ndarray) -> Dict[str, np.
             filter_timings[filter_id] = 0
     
     # Calculate total time
-    total_elapsed_time = time.time() - total_start_time
+    total_elapsed_time = time.perf_counter() - total_start_time
     
     # Count successful filters
     successful = sum(1 for v in results.values() if v is not None)
@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+# Distinct (shape, dtype) keys kept, and idle buffers kept per key (one per
+# filter running concurrently on that shape)
+_MAX_SHAPES = 8
+_MAX_PER_SHAPE = 4
+
+_lock = threading.Lock()
+_free: "OrderedDict[Tuple[tuple, np.dtype], List[np.ndarray]]" = OrderedDict()
+
+
+@contextmanager
+def get_buf(shape: tuple, dtype) -> Iterator[np.ndarray]:
+    """
+    Borrow an uninitialized working array from the shared buffer pool.
+
+    Requests repeat the same image shapes, so intermediate arrays are taken
+    from a small LRU of idle buffers keyed by (shape, dtype) instead of being
+    allocated (and page-faulted in) on every call. The buffer belongs to the
+    caller until the block exits; it must not escape as a filter result.
+
+    Args:
+        shape: Array shape
+        dtype: Array dtype
+
+    Yields:
+        Array of the given shape and dtype with arbitrary contents
+    """
+    key = (tuple(shape), np.dtype(dtype))
+    with _lock:
+        idle = _free.get(key)
+        buffer = idle.pop() if idle else None
+    if buffer is None:
+        buffer = np.empty(key[0], dtype=key[1])
+
+    try:
+        yield buffer
+    finally:
+        with _lock:
+            idle = _free.setdefault(key, [])
+            _free.move_to_end(key)
+            if len(idle) < _MAX_PER_SHAPE:
+                idle.append(buffer)
+            while len(_free) > _MAX_SHAPES:
+                _free.popitem(last=False)
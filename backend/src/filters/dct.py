@@ -1,5 +1,6 @@
 import numpy as np
 from loguru import logger
+from scipy.fft import dctn
 import time
 
 
@@ -30,33 +31,40 @@ def apply_dct(image: np.ndarray) -> np.ndarray:
     # Convert to float for DCT computation
     img_float = image.astype(np.float64)
 
-    # Step 1: Apply 2D DCT using custom implementation
+    # Step 1: Apply 2D DCT
     dct_coeffs = _dct2d(img_float)
 
+    # Steps 2-4 run in place on one float32 buffer: the result is 8-bit, so
+    # single precision is ample and halves the memory traffic of each pass
+
     # Step 2: Compute absolute values
-    dct_abs = np.abs(dct_coeffs)
+    dct_abs = np.abs(dct_coeffs, out=np.empty(dct_coeffs.shape, dtype=np.float32))
+    raw_min = dct_abs.min()
+    raw_max = dct_abs.max()
 
-    logger.info(f"DCT - Coefficient range: [{dct_abs.min():.2f}, {dct_abs.max():.2f}]")
+    logger.info(f"DCT - Coefficient range: [{raw_min:.2f}, {raw_max:.2f}]")
 
     # Step 3: Apply log transform for better visualization
-    dct_log = np.log1p(dct_abs)
+    np.log1p(dct_abs, out=dct_abs)
 
     # Step 4: Normalize to 0-255 range
-    dct_min = dct_log.min()
-    dct_max = dct_log.max()
+    dct_min = dct_abs.min()
+    dct_max = dct_abs.max()
 
     if dct_max - dct_min > 0:
-        normalized = (dct_log - dct_min) / (dct_max - dct_min) * 255
+        np.subtract(dct_abs, dct_min, out=dct_abs)
+        np.divide(dct_abs, dct_max - dct_min, out=dct_abs)
+        np.multiply(dct_abs, 255, out=dct_abs)
     else:
         logger.warning("DCT: uniform coefficients, returning zeros")
-        normalized = np.zeros_like(dct_log)
+        dct_abs.fill(0)
 
-    result = normalized.astype(np.uint8)
+    result = dct_abs.astype(np.uint8)
 
     elapsed_time = time.time() - start_time
     logger.info(
         f"DCT - Output shape: {result.shape}, "
-        f"Coefficient range (raw): [{dct_abs.min():.2f}, {dct_abs.max():.2e}], "
+        f"Coefficient range (raw): [{raw_min:.2f}, {raw_max:.2e}], "
         f"After log+normalize: [0, 255], "
         f"Processing time: {elapsed_time:.4f}s"
     )
@@ -66,47 +74,17 @@ def apply_dct(image: np.ndarray) -> np.ndarray:
 
 def _dct2d(image: np.ndarray) -> np.ndarray:
     """
-    Compute 2D Discrete Cosine Transform using NumPy.
-
-    Uses separable property: DCT2D(image) = DCT(DCT(image)^T)^T
-
-    Args:
-        image: Input image array (H, W)
-
-    Returns:
-        DCT coefficients (H, W)
-    """
-    # Apply 1D DCT to rows, then to columns
-    dct_rows = _dct1d_matrix(image.shape[0]) @ image
-    dct_2d = dct_rows @ _dct1d_matrix(image.shape[1]).T
-
-    return dct_2d
-
-
-def _dct1d_matrix(n: int) -> np.ndarray:
-    """
-    Generate DCT-II transformation matrix for 1D DCT.
+    Compute orthonormal 2D Discrete Cosine Transform (DCT-II).
 
     DCT-II formula:
     X[k] = sum_{n=0}^{N-1} x[n] * cos(pi * k * (2n + 1) / (2N))
 
+    Uses scipy's pocketfft, an O(N^2 log N) FFT-based DCT, across all cores.
+
     Args:
-        n: Size of the transform
+        image: Input image array (H, W)
 
     Returns:
-        DCT transformation matrix (n, n)
+        DCT coefficients (H, W)
     """
-    matrix = np.zeros((n, n), dtype=np.float64)
-
-    for k in range(n):
-        for i in range(n):
-            if k == 0:
-                # DC component normalization
-                matrix[k, i] = np.sqrt(1.0 / n)
-            else:
-                # AC components
-                matrix[k, i] = np.sqrt(2.0 / n) * np.cos(
-                    np.pi * k * (2 * i + 1) / (2 * n)
-                )
-
-    return matrix
+    return dctn(image, type=2, norm="ortho", workers=-1)
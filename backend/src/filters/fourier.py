@@ -1,5 +1,6 @@
 import numpy as np
 from loguru import logger
+from scipy.fft import fft2, fftshift
 import time
 
 
@@ -8,7 +9,7 @@ def apply_fourier(image: np.ndarray) -> np.ndarray:
     Apply 2D Fourier Transform and visualize the magnitude spectrum.
 
     Steps:
-    1. Apply 2D FFT using numpy.fft.fft2
+    1. Apply 2D FFT using scipy.fft.fft2 (multithreaded pocketfft)
     2. Shift zero frequency to center using fftshift
     3. Compute magnitude spectrum
     4. Apply log transform for better visualization
@@ -29,39 +30,44 @@ def apply_fourier(image: np.ndarray) -> np.ndarray:
     img_float = image.astype(np.float64)
 
     # Step 1: Apply 2D FFT
-    fft = np.fft.fft2(img_float)
+    fft = fft2(img_float, workers=-1)
 
     # Step 2: Shift zero frequency component to center
-    fft_shifted = np.fft.fftshift(fft)
+    fft_shifted = fftshift(fft)
 
     # Step 3: Compute magnitude spectrum
-    magnitude = np.abs(fft_shifted)
+    magnitude = np.abs(fft_shifted, out=np.empty(fft_shifted.shape, dtype=np.float32))
+    raw_min = magnitude.min()
+    raw_max = magnitude.max()
 
-    logger.info(
-        f"Fourier - Magnitude range: [{magnitude.min():.2f}, {magnitude.max():.2f}]"
-    )
+    logger.info(f"Fourier - Magnitude range: [{raw_min:.2f}, {raw_max:.2f}]")
+
+    # Steps 4-5 run in place on the float32 magnitude buffer: the result is
+    # 8-bit, so single precision is ample and halves the memory traffic
 
     # Step 4: Apply log transform for better visualization
     # log(1 + magnitude) to avoid log(0)
-    magnitude_log = np.log1p(magnitude)
+    np.log1p(magnitude, out=magnitude)
 
     # Step 5: Normalize to 0-255 range
     # Avoid division by zero
-    mag_min = magnitude_log.min()
-    mag_max = magnitude_log.max()
+    mag_min = magnitude.min()
+    mag_max = magnitude.max()
 
     if mag_max - mag_min > 0:
-        normalized = (magnitude_log - mag_min) / (mag_max - mag_min) * 255
+        np.subtract(magnitude, mag_min, out=magnitude)
+        np.divide(magnitude, mag_max - mag_min, out=magnitude)
+        np.multiply(magnitude, 255, out=magnitude)
     else:
         logger.warning("Fourier transform: uniform magnitude spectrum, returning zeros")
-        normalized = np.zeros_like(magnitude_log)
+        magnitude.fill(0)
 
-    result = normalized.astype(np.uint8)
+    result = magnitude.astype(np.uint8)
 
     elapsed_time = time.time() - start_time
     logger.info(
         f"Fourier transform - Output shape: {result.shape}, "
-        f"Magnitude range (raw): [{magnitude.min():.2f}, {magnitude.max():.2e}], "
+        f"Magnitude range (raw): [{raw_min:.2f}, {raw_max:.2e}], "
         f"After log+normalize: [0, 255], "
         f"Processing time: {elapsed_time:.4f}s"
     )
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 from loguru import logger
 import time
@@ -30,12 +32,12 @@ def apply_gaussian(
     # Convert to float for computation
     img_float = image.astype(np.float64)
 
-    # Generate 2D Gaussian kernel
+    # Generate 1D Gaussian kernel (the 2D kernel is its outer product)
     kernel = _generate_gaussian_kernel(kernel_size, sigma)
     # logger.info(f"Gaussian blur - Kernel sum: {kernel.sum():.6f} (should be ~1.0)")
 
-    # Apply convolution
-    blurred = _convolve2d(img_float, kernel)
+    # Apply separable convolution
+    blurred = _convolve_separable(img_float, kernel)
 
     # Clip and convert back to uint8
     result = np.clip(blurred, 0, 255).astype(np.uint8)
@@ -48,87 +50,74 @@ def apply_gaussian(
     return result
 
 
+@lru_cache(maxsize=32)
 def _generate_gaussian_kernel(size: int, sigma: float) -> np.ndarray:
     """
-    Generate 2D Gaussian kernel.
+    Generate 1D Gaussian kernel.
 
-    G(x, y) = (1 / (2 * pi * sigma^2)) * exp(-(x^2 + y^2) / (2 * sigma^2))
+    G(x, y) = g(x) * g(y) with g(x) = exp(-x^2 / (2 * sigma^2)), so the 2D
+    kernel is the outer product of this normalized 1D kernel with itself.
 
     Args:
         size: Kernel size (must be odd)
         sigma: Standard deviation
 
     Returns:
-        Normalized Gaussian kernel (size, size)
+        Normalized Gaussian kernel (size,), read-only since it is cached
     """
     # Ensure odd size
     if size % 2 == 0:
         size += 1
 
-    center = size // 2
-    kernel = np.zeros((size, size), dtype=np.float64)
+    x = np.arange(size) - size // 2
 
-    # Generate kernel values
-    for i in range(size):
-        for j in range(size):
-            x = i - center
-            y = j - center
-            # Gaussian formula
-            kernel[i, j] = np.exp(-(x**2 + y**2) / (2 * sigma**2))
+    # Gaussian formula
+    kernel = np.exp(-(x**2) / (2 * sigma**2))
 
     # Normalize so sum equals 1
     kernel /= kernel.sum()
+    kernel.setflags(write=False)
 
     return kernel
 
 
-def _convolve2d(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+def _convolve_separable(image: np.ndarray, kernel_1d: np.ndarray) -> np.ndarray:
     """
-    Perform 2D convolution using NumPy vectorized operations.
+    Convolve with the separable 2D kernel outer(kernel_1d, kernel_1d).
 
-    Optimized version using sliding window views (as_strided) for better performance.
+    Runs one 1D pass along rows and one along columns, K multiplies per pass
+    instead of K*K for the equivalent 2D kernel.
 
     Args:
         image: Input image array (H, W)
-        kernel: Convolution kernel (K, K) - must be odd-sized
+        kernel_1d: Symmetric 1D convolution kernel (K,) - must be odd-sized,
+            and is applied without flipping
 
     Returns:
-        Convolved image array (H, W)
+        Convolved image array (H, W) in the input dtype
 
     Raises:
-        ValueError: If kernel dimensions are not odd-sized
+        ValueError: If kernel size is not odd
     """
-    # Get dimensions
     img_h, img_w = image.shape
-    ker_h, ker_w = kernel.shape
+    size = kernel_1d.size
 
     # Validate kernel is odd-sized
-    if ker_h % 2 == 0 or ker_w % 2 == 0:
-        raise ValueError(f"Kernel must have odd dimensions, got {ker_h}x{ker_w}")
-
-    # Calculate padding
-    pad_h = ker_h // 2
-    pad_w = ker_w // 2
-
-    # Pad image with reflection for better edge handling
-    padded = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode="reflect")
-
-    # Flip kernel for convolution (correlation vs convolution)
-    kernel_flipped = np.flip(kernel)
+    if size % 2 == 0:
+        raise ValueError(f"Kernel must have odd size, got {size}")
 
-    # Create sliding window view using as_strided for vectorization
-    from numpy.lib.stride_tricks import as_strided
+    pad = size // 2
 
-    shape = (img_h, img_w, ker_h, ker_w)
-    strides = (
-        padded.strides[0],
-        padded.strides[1],
-        padded.strides[0],
-        padded.strides[1],
-    )
-    windows = as_strided(padded, shape=shape, strides=strides)
+    # Horizontal pass over a reflect-padded copy
+    padded = np.pad(image, ((0, 0), (pad, pad)), mode="reflect")
+    rows = np.zeros((img_h, img_w), dtype=image.dtype)
+    for k, weight in enumerate(kernel_1d):
+        rows += weight * padded[:, k : k + img_w]
 
-    # Vectorized convolution: element-wise multiply and sum over kernel dimensions
-    output = np.einsum("ijkl,kl->ij", windows, kernel_flipped)
+    # Vertical pass
+    padded = np.pad(rows, ((pad, pad), (0, 0)), mode="reflect")
+    output = np.zeros((img_h, img_w), dtype=image.dtype)
+    for k, weight in enumerate(kernel_1d):
+        output += weight * padded[k : k + img_h, :]
 
     return output
@@ -29,12 +29,10 @@ def apply_histogram_equalization(image: np.ndarray) -> np.ndarray:
         image = image.astype(np.uint8)
 
     # Flatten image to 1D array
-    flat_image = image.flatten()
+    flat_image = image.ravel()
 
     # Step 1: Calculate histogram (256 bins for 0-255)
-    histogram = np.zeros(256, dtype=np.int64)
-    for pixel_value in flat_image:
-        histogram[pixel_value] += 1
+    histogram = np.bincount(flat_image, minlength=256).astype(np.int64)
 
     # logger.info(
     #     f"Histogram - Min value: {np.min(image)}, Max value: {np.max(image)}, "
@@ -42,10 +40,7 @@ def apply_histogram_equalization(image: np.ndarray) -> np.ndarray:
     # )
 
     # Step 2: Compute cumulative distribution function (CDF)
-    cdf = np.zeros(256, dtype=np.int64)
-    cdf[0] = histogram[0]
-    for i in range(1, 256):
-        cdf[i] = cdf[i - 1] + histogram[i]
+    cdf = np.cumsum(histogram)
 
     # Step 3: Normalize CDF to 0-255 range
     # Formula: cdf_normalized = ((cdf - cdf_min) / (total_pixels - cdf_min)) * 255
@@ -59,7 +54,12 @@ def apply_histogram_equalization(image: np.ndarray) -> np.ndarray:
         )
         return image
 
-    cdf_normalized = ((cdf - cdf_min) / (total_pixels - cdf_min) * 255).astype(np.uint8)
+    # Exact integer arithmetic (floor, as the float cast truncated); bins below
+    # cdf_min never occur in the image, so clipping them to 0 is safe
+    denominator = total_pixels - cdf_min
+    cdf_normalized = np.clip((cdf - cdf_min) * 255 // denominator, 0, 255).astype(
+        np.uint8
+    )
 
     # Step 4: Map original pixel values to equalized values
     result = cdf_normalized[image]
@@ -1,5 +1,5 @@
+import cv2
 import numpy as np
-from numpy.lib.stride_tricks import sliding_window_view
 from loguru import logger
 import time
 
@@ -8,8 +8,9 @@ def apply_median(image: np.ndarray, window_size: int = 5) -> np.ndarray:
     """
     Apply median filter to grayscale image for noise reduction.
 
-    Uses vectorized sliding window approach for fast median computation.
-    Effective for removing salt-and-pepper noise.
+    Uses OpenCV's medianBlur, which updates per-column histograms as the
+    window slides (Huang / constant-time median) instead of sorting every
+    window. Effective for removing salt-and-pepper noise.
 
     Args:
         image: Input grayscale image as numpy array (H, W) with values 0-255
@@ -19,8 +20,8 @@ def apply_median(image: np.ndarray, window_size: int = 5) -> np.ndarray:
         Filtered image as numpy array (H, W) with values 0-255
 
     Note:
-        Vectorized implementation may use up to ~800MB RAM for 2048×2048 images.
-        Performance: ~0.2-0.4s for 1024×1024 images (25-50x faster than loop-based).
+        Works on uint8 in place of a float window array, so extra memory is
+        O(H*W) regardless of window size.
     """
     start_time = time.time()
 
@@ -35,29 +36,9 @@ def apply_median(image: np.ndarray, window_size: int = 5) -> np.ndarray:
         window_size += 1
         logger.warning(f"Window size adjusted to {window_size} (must be odd)")
 
-    # Get image dimensions
-    h, w = image.shape
-
-    # Calculate padding
-    pad = window_size // 2
-
-    # Pad image with edge values for better boundary handling
-    padded = np.pad(image, ((pad, pad), (pad, pad)), mode="edge")
-
-    # Vectorized median using sliding windows (faster but memory-intensive)
-    try:
-        windows = sliding_window_view(padded, (window_size, window_size))
-        result = np.median(windows, axis=(2, 3)).astype(np.uint8)
-    except MemoryError:
-        logger.warning(
-            "Insufficient memory for vectorized median, using loop-based fallback"
-        )
-        # Fallback to loop-based approach for low-memory systems
-        result = np.zeros_like(image, dtype=np.uint8)
-        for i in range(h):
-            for j in range(w):
-                window = padded[i : i + window_size, j : j + window_size]
-                result[i, j] = np.median(window)
+    # Edge-value padding (BORDER_REPLICATE), as np.pad(mode="edge") did.
+    # An odd window has a single middle element, so the median stays exact
+    result = cv2.medianBlur(np.ascontiguousarray(image, dtype=np.uint8), window_size)
 
     elapsed_time = time.time() - start_time
     logger.info(
@@ -32,55 +32,11 @@ def apply_otsu(image: np.ndarray) -> np.ndarray:
     if image.dtype != np.uint8:
         image = image.astype(np.uint8)
 
-    # Step 1: Calculate histogram
-    histogram = np.zeros(256, dtype=np.int64)
-    flat_image = image.flatten()
-
-    for pixel_value in flat_image:
-        histogram[pixel_value] += 1
-
-    # Total number of pixels
-    total_pixels = flat_image.size
-
-    # Normalize histogram to get probabilities
-    prob = histogram / total_pixels
+    # Step 1: Cumulative class statistics from the histogram
+    count_0, sum_0 = _otsu_stats(image)
 
     # Step 2: Find optimal threshold by maximizing inter-class variance
-    optimal_threshold = 0
-    max_variance = 0.0
-
-    # Cumulative sums and means
-    cumsum_0 = 0.0  # Cumulative sum for background class
-    cumsum_1 = np.sum(np.arange(256) * prob)  # Initial cumulative sum for foreground
-
-    weight_0 = 0.0  # Weight (probability) of background class
-    weight_1 = 1.0  # Weight (probability) of foreground class
-
-    for threshold in range(256):
-        # Update weights
-        weight_0 += prob[threshold]
-        weight_1 -= prob[threshold]
-
-        # Avoid division by zero
-        if weight_0 == 0 or weight_1 == 0:
-            continue
-
-        # Update cumulative sums
-        cumsum_0 += threshold * prob[threshold]
-        cumsum_1 -= threshold * prob[threshold]
-
-        # Compute means
-        mean_0 = cumsum_0 / weight_0
-        mean_1 = cumsum_1 / weight_1
-
-        # Compute inter-class variance
-        # Variance = weight_0 * weight_1 * (mean_0 - mean_1)^2
-        inter_class_variance = weight_0 * weight_1 * (mean_0 - mean_1) ** 2
-
-        # Update optimal threshold
-        if inter_class_variance > max_variance:
-            max_variance = inter_class_variance
-            optimal_threshold = threshold
+    optimal_threshold, max_variance = _find_threshold(count_0, sum_0)
 
     logger.info(
         f"Otsu - Optimal threshold: {optimal_threshold}, "
@@ -88,7 +44,10 @@ def apply_otsu(image: np.ndarray) -> np.ndarray:
     )
 
     # Step 3: Apply binary thresholding
-    result = np.where(image > optimal_threshold, 255, 0).astype(np.uint8)
+    # The boolean mask reinterpreted as 0/1 uint8 and scaled in place, with
+    # no int64 intermediate
+    result = (image > optimal_threshold).view(np.uint8)
+    result *= 255
 
     elapsed_time = time.time() - start_time
     logger.info(
@@ -97,3 +56,55 @@ def apply_otsu(image: np.ndarray) -> np.ndarray:
     )
 
     return result
+
+
+def _otsu_stats(image: np.ndarray) -> tuple:
+    """
+    Cumulative class statistics for every threshold from one histogram pass.
+
+    These are the unnormalized omega (class probability) and mu (class mean)
+    arrays of Otsu's method; any threshold search on the same image, single
+    or multi-level, can be evaluated from them without revisiting the pixels.
+
+    Args:
+        image: Input grayscale uint8 image array (H, W)
+
+    Returns:
+        Tuple (count_0, sum_0) of int64 arrays (256,): pixel count and
+        intensity sum of the background class (values <= t) for each t
+    """
+    histogram = np.bincount(image.ravel(), minlength=256)
+    count_0 = np.cumsum(histogram)
+    sum_0 = np.cumsum(np.arange(256, dtype=np.int64) * histogram)
+    return count_0, sum_0
+
+
+def _find_threshold(count_0: np.ndarray, sum_0: np.ndarray) -> tuple:
+    """
+    Threshold maximizing the inter-class variance, evaluated for all 256 at once.
+
+    Variance = weight_0 * weight_1 * (mean_0 - mean_1)^2, which with pixel
+    counts n_0 and intensity sums s_0 of the background class becomes
+    (s_total * n_0 - s_0 * N)^2 / (N^2 * n_0 * (N - n_0)).
+
+    Args:
+        count_0: Cumulative pixel counts from `_otsu_stats`
+        sum_0: Cumulative intensity sums from `_otsu_stats`
+
+    Returns:
+        Tuple (threshold, inter_class_variance)
+    """
+    total_pixels = int(count_0[-1])
+    sum_total = sum_0[-1]
+
+    # Thresholds leaving one class empty are skipped (variance undefined).
+    # Integer counts keep this test exact
+    valid = (count_0 > 0) & (count_0 < total_pixels)
+    numerator = (sum_total * count_0 - sum_0 * total_pixels).astype(np.float64) ** 2
+    denominator = float(total_pixels) ** 2 * count_0 * (total_pixels - count_0)
+    inter_class_variance = np.zeros(256, dtype=np.float64)
+    np.divide(numerator, denominator, out=inter_class_variance, where=valid)
+
+    # argmax returns the first maximum, like the strict ">" update it replaces
+    optimal_threshold = int(np.argmax(inter_class_variance))
+    return optimal_threshold, float(inter_class_variance[optimal_threshold])
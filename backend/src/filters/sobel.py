@@ -1,7 +1,14 @@
+from functools import lru_cache
+
 import numpy as np
 from loguru import logger
 import time
 
+from ._buffers import get_buf
+
+# Below this many pixels the host-device copies outweigh the GPU speedup
+_CUDA_MIN_PIXELS = 512 * 512
+
 
 def apply_sobel(image: np.ndarray) -> np.ndarray:
     """
@@ -21,90 +28,159 @@ def apply_sobel(image: np.ndarray) -> np.ndarray:
     # Log input
     logger.info(f"Sobel filter - Input shape: {image.shape}, dtype: {image.dtype}")
 
-    # Convert to float for computation
-    img_float = image.astype(np.float64)
+    # A constant image (e.g. blank background) has no gradient anywhere; one
+    # min/max pass over the input replaces both gradient passes
+    if image.size and image.min() == image.max():
+        result = np.zeros(image.shape, dtype=np.uint8)
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"Sobel filter - Constant input, empty edge map, "
+            f"Processing time: {elapsed_time:.4f}s"
+        )
+        return result
+
+    # Intermediates come from the shared buffer pool; only the uint8 result
+    # is allocated per call
+    height, width = image.shape
+    with get_buf(image.shape, np.float64) as magnitude:
+        # Apply separable Sobel convolution, on the GPU when one is available
+        device = _cuda_device()
+        if device is not None and image.size >= _CUDA_MIN_PIXELS and min(image.shape) > 1:
+            squared = _squared_magnitude_cuda(image, device)
+            np.sqrt(squared, out=magnitude, dtype=np.float64)
+        else:
+            with (
+                get_buf((height + 2, width + 2), np.float32) as padded,
+                get_buf((height + 2, width), np.float32) as scratch,
+                get_buf(image.shape, np.float32) as gradient_x,
+                get_buf(image.shape, np.float32) as gradient_y,
+            ):
+                _sobel_gradients(image, padded, scratch, gradient_x, gradient_y)
+                np.multiply(gradient_x, gradient_x, out=gradient_x)
+                np.multiply(gradient_y, gradient_y, out=gradient_y)
+                squared = np.add(gradient_x, gradient_y, out=gradient_x)
+
+                # Calculate gradient magnitude. The squared sum is still an
+                # exact integer in float32 (on either device); the square root
+                # runs in float64 so normalization rounds exactly as before
+                np.sqrt(squared, out=magnitude, dtype=np.float64)
+
+        # Normalize to 0-255 range for better visualization
+        mag_min = magnitude.min()
+        mag_max = magnitude.max()
+
+        # In place on the magnitude buffer; same operation order as the
+        # expression form so the uint8 output does not change
+        if mag_max - mag_min > 0:
+            np.subtract(magnitude, mag_min, out=magnitude)
+            np.divide(magnitude, mag_max - mag_min, out=magnitude)
+            np.multiply(magnitude, 255, out=magnitude)
+        else:
+            magnitude.fill(0)
+
+        result = magnitude.astype(np.uint8)
 
-    # Define 3x3 Sobel kernels
-    sobel_x = np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=np.float64)
+    elapsed_time = time.time() - start_time
+    logger.info(
+        f"Sobel filter - Output shape: {result.shape}, "
+        f"Gradient range: [{mag_min:.2f}, {mag_max:.2f}], "
+        f"Processing time: {elapsed_time:.4f}s"
+    )
 
-    sobel_y = np.array([[-1, -2, -1], [0, 0, 0], [1, 2, 1]], dtype=np.float64)
+    return result
 
-    # Apply convolution manually (without scipy or cv2)
-    gradient_x = _convolve2d(img_float, sobel_x)
-    gradient_y = _convolve2d(img_float, sobel_y)
 
-    # Calculate gradient magnitude
-    magnitude = np.sqrt(gradient_x**2 + gradient_y**2)
+def _sobel_gradients(
+    image: np.ndarray,
+    padded: np.ndarray,
+    scratch: np.ndarray,
+    gradient_x: np.ndarray,
+    gradient_y: np.ndarray,
+) -> None:
+    """
+    Compute Sobel gradients with separable 1D passes into caller buffers.
 
-    # Normalize to 0-255 range for better visualization
-    mag_min = magnitude.min()
-    mag_max = magnitude.max()
+    Each 3x3 Sobel kernel is the outer product of a derivative [-1, 0, 1] and
+    a smoothing [1, 2, 1] vector, so one shared reflect-padded copy and four
+    slice additions replace two 3x3 convolutions (2K instead of K^2 operations
+    per pixel). The values are small integers, exact in float32.
 
-    if mag_max - mag_min > 0:
-        magnitude = ((magnitude - mag_min) / (mag_max - mag_min)) * 255
+    Args:
+        image: Input grayscale image array (H, W)
+        padded: float32 work array (H + 2, W + 2)
+        scratch: float32 work array (H + 2, W)
+        gradient_x: float32 output array (H, W)
+        gradient_y: float32 output array (H, W); the sign convention is
+            irrelevant to the magnitude
+    """
+    if min(image.shape) > 1:
+        # Reflect padding written in place (same layout as np.pad "reflect")
+        np.copyto(padded[1:-1, 1:-1], image, casting="unsafe")
+        padded[0, 1:-1] = padded[2, 1:-1]
+        padded[-1, 1:-1] = padded[-3, 1:-1]
+        padded[:, 0] = padded[:, 2]
+        padded[:, -1] = padded[:, -3]
     else:
-        magnitude = np.zeros_like(magnitude)
+        padded[...] = np.pad(image.astype(np.float32), 1, mode="reflect")
 
-    result = magnitude.astype(np.uint8)
+    # x: derivative along rows, then smooth down columns
+    diff_x = np.subtract(padded[:, 2:], padded[:, :-2], out=scratch)
+    np.add(diff_x[:-2], diff_x[2:], out=gradient_x)
+    np.add(gradient_x, diff_x[1:-1], out=gradient_x)
+    np.add(gradient_x, diff_x[1:-1], out=gradient_x)
 
-    elapsed_time = time.time() - start_time
-    logger.info(
-        f"Sobel filter - Output shape: {result.shape}, "
-        f"Gradient range: [{mag_min:.2f}, {mag_max:.2f}], "
-        f"Processing time: {elapsed_time:.4f}s"
-    )
+    # y: smooth along rows, then derivative down columns
+    smooth_x = np.add(padded[:, :-2], padded[:, 2:], out=scratch)
+    np.add(smooth_x, padded[:, 1:-1], out=smooth_x)
+    np.add(smooth_x, padded[:, 1:-1], out=smooth_x)
+    np.subtract(smooth_x[2:], smooth_x[:-2], out=gradient_y)
 
-    return result
 
+@lru_cache(maxsize=1)
+def _cuda_device():
+    """CUDA device for the GPU path, or None without torch or a GPU."""
+    try:
+        import torch
+    except ImportError:
+        return None
+
+    if not torch.cuda.is_available():
+        return None
 
-def _convolve2d(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    logger.info("Sobel filter - CUDA available, large images run on the GPU")
+    return torch.device("cuda")
+
+
+def _squared_magnitude_cuda(image: np.ndarray, device) -> np.ndarray:
     """
-    Perform 2D convolution using NumPy vectorized operations.
+    Squared Sobel gradient magnitude computed on the GPU.
 
-    Optimized version using sliding window views (as_strided) for better performance.
+    Runs the same separable slice passes as `_sobel_gradients` on a float32
+    device tensor; every value is an exact integer, so the result equals the
+    CPU path bit for bit. Only the uint8 input goes to the device and one
+    float32 array comes back.
 
     Args:
-        image: Input image array (H, W)
-        kernel: Convolution kernel (K, K) - must be odd-sized
+        image: Input grayscale image array (H, W), at least 2x2
+        device: torch CUDA device
 
     Returns:
-        Convolved image array (H, W)
-
-    Raises:
-        ValueError: If kernel dimensions are not odd-sized
+        gradient_x**2 + gradient_y**2 as a float32 array (H, W)
     """
-    # Get dimensions
-    img_h, img_w = image.shape
-    ker_h, ker_w = kernel.shape
-
-    # Validate kernel is odd-sized
-    if ker_h % 2 == 0 or ker_w % 2 == 0:
-        raise ValueError(f"Kernel must have odd dimensions, got {ker_h}x{ker_w}")
-
-    # Calculate padding
-    pad_h = ker_h // 2
-    pad_w = ker_w // 2
-
-    # Pad image with reflection for better edge handling
-    padded = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode="reflect")
-
-    # Flip kernel for convolution (correlation vs convolution)
-    kernel_flipped = np.flip(kernel)
-
-    # Create sliding window view using as_strided for vectorization
-    # This avoids nested loops and is much faster
-    from numpy.lib.stride_tricks import as_strided
-
-    shape = (img_h, img_w, ker_h, ker_w)
-    strides = (
-        padded.strides[0],
-        padded.strides[1],
-        padded.strides[0],
-        padded.strides[1],
-    )
-    windows = as_strided(padded, shape=shape, strides=strides)
+    import torch
+    import torch.nn.functional as F
+
+    with torch.inference_mode():
+        tensor = torch.tensor(image, dtype=torch.uint8, device=device).float()
+        padded = F.pad(tensor[None, None], (1, 1, 1, 1), mode="reflect")[0, 0]
+
+        # x: derivative along rows, then smooth down columns
+        diff_x = padded[:, 2:] - padded[:, :-2]
+        gradient_x = diff_x[:-2] + diff_x[2:] + 2 * diff_x[1:-1]
 
-    # Vectorized convolution: element-wise multiply and sum over kernel dimensions
-    output = np.einsum("ijkl,kl->ij", windows, kernel_flipped)
+        # y: smooth along rows, then derivative down columns
+        smooth_x = padded[:, :-2] + padded[:, 2:] + 2 * padded[:, 1:-1]
+        gradient_y = smooth_x[2:] - smooth_x[:-2]
 
-    return output
+        squared = gradient_x * gradient_x + gradient_y * gradient_y
+        return squared.cpu().numpy()
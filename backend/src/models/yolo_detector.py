@@ -1,20 +1,39 @@
+import json
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional, Any
+import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from loguru import logger
 
 from backend.src.config.settings import (
     MODEL_WEIGHTS_PATH,
+    MODEL_ENGINE_PATH,
+    MODEL_TORCHSCRIPT_PATH,
+    MODEL_INT8_ENGINE_PATH,
+    MODEL_OPENVINO_INT8_PATH,
     YOLO_CONFIDENCE_THRESHOLD,
     YOLO_CONFIDENCE_HIGH,
     YOLO_CONFIDENCE_MEDIUM,
+    YOLO_INPUT_SIZE,
+    YOLO_ENGINE_WORKSPACE_GB,
+    YOLO_WARMUP_ITERATIONS,
+    YOLO_KEEPALIVE_INTERVAL_S,
+    YOLO_PRECISION,
+    YOLO_MAX_BATCH_SIZE,
+    LABEL_FONT_SIZE,
     ERROR_MODEL_NOT_LOADED,
 )
 from backend.src.utils.class_mapping import get_vietnamese_name
 from backend.src.utils.health_info import get_health_info
-from backend.src.utils.preprocessing import preprocess_image
+from backend.src.utils.preprocessing import (
+    equalize_grayscale,
+    letterbox,
+    to_input_tensor,
+)
 
 
 class YOLODetector:
@@ -30,6 +49,22 @@ class YOLODetector:
         self.model = None
         self.model_loaded = False
         self.load_time_ms = None
+        # Per-thread scratch buffer for annotated output, reused across calls
+        self._scratch = threading.local()
+
+        # Inference device and persistent input buffers, set up by load_model()
+        self.device = "cpu"
+        self._stream = None
+        self._host_input = None
+        self._device_input = None
+        self.max_batch_size = 1
+        self._inference_lock = threading.Lock()
+
+        # GPU keep-alive between sporadic requests, started by load_model()
+        self._dummy_input = None
+        self._last_inference = 0.0
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread = None
 
         logger.info(f"YOLODetector initialized with threshold: {confidence_threshold}")
         logger.info(f"Model path: {self.model_path}")
@@ -50,7 +85,12 @@ class YOLODetector:
         try:
             from ultralytics import YOLO
 
-            self.model = YOLO(str(self.model_path))
+            # task must be given explicitly for exported models
+            self.model = YOLO(str(self.model_path), task="detect")
+            self._setup_device()
+            self._warmup()
+            if self._stream is not None and YOLO_KEEPALIVE_INTERVAL_S > 0:
+                self._start_keepalive()
 
             end_time = time.time()
             self.load_time_ms = int((end_time - start_time) * 1000)
@@ -63,64 +103,253 @@ class YOLODetector:
             logger.exception(e)
             raise
 
-    def predict(self, image: np.ndarray) -> List[Dict[str, Any]]:
-        if not self.model_loaded:
-            raise RuntimeError(ERROR_MODEL_NOT_LOADED)
+    def _setup_device(self):
+        import torch
 
-        logger.info(f"Inference - Image: {image.shape}, {image.dtype}")
+        # PyTorch weights take any batch; an engine takes what it was built
+        # for; the other exports have a static batch of one
+        if self.model_path.suffix == ".pt":
+            self.max_batch_size = YOLO_MAX_BATCH_SIZE
+        elif self.model_path.suffix == ".engine":
+            self.max_batch_size = _engine_max_batch_size(self.model_path)
+        else:
+            self.max_batch_size = 1
+        logger.info(f"YOLO max batch size: {self.max_batch_size}")
+
+        if torch.cuda.is_available():
+            # Run FP16 on the GPU with a dedicated stream and input buffers that
+            # are reused across requests: pinned host memory for async H2D copies
+            # and a 3-channel device tensor the model reads from
+            self.device = "cuda:0"
+            self._stream = torch.cuda.Stream(device=self.device)
+        else:
+            self.device = "cpu"
+        self._allocate_inputs(1)
 
-        # Preprocess: histogram equalization only
-        image = preprocess_image(image)
-        logger.info(f"Preprocessed: {image.shape}, {image.dtype}")
+        logger.info(f"YOLO inference device: {self.device}")
 
-        start_time = time.time()
+    def _warmup(self):
+        # Pay engine deserialization, lazy CUDA init and kernel selection at
+        # load time instead of on the first request
+        blank = np.zeros((YOLO_INPUT_SIZE, YOLO_INPUT_SIZE), dtype=np.uint8)
+        self._dummy_input = {"tensor": to_input_tensor(blank)}
 
-        # YOLO auto-handles: resize, normalize, letterbox, grayscale→RGB
-        results = self.model.predict(
-            image,
-            conf=self.confidence_threshold,
-            verbose=False,
-            imgsz=1024,
+        start_time = time.time()
+        for _ in range(YOLO_WARMUP_ITERATIONS):
+            self._run_model([self._dummy_input])
+        warmup_ms = int((time.time() - start_time) * 1000)
+
+        logger.info(f"YOLO warm-up: {YOLO_WARMUP_ITERATIONS} passes in {warmup_ms}ms")
+
+        # Probe and parse the label font now rather than on the first annotation
+        _load_label_font()
+
+    def _start_keepalive(self):
+        # Opt-in: between sporadic requests the GPU drops its clocks and
+        # inference latency regresses; a dummy pass whenever no request has
+        # run for one interval keeps it in its high-performance state, at
+        # the cost of the GPU never idling
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive, name="yolo-keepalive", daemon=True
         )
+        self._keepalive_thread.start()
+        logger.info(f"YOLO keep-alive every {YOLO_KEEPALIVE_INTERVAL_S}s when idle")
 
-        end_time = time.time()
-        inference_time_ms = int((end_time - start_time) * 1000)
+    def _keepalive(self):
+        interval = YOLO_KEEPALIVE_INTERVAL_S
+        while not self._keepalive_stop.wait(interval):
+            if time.monotonic() - self._last_inference < interval:
+                continue
 
-        # Parse results
-        detections = []
+            # Never make a real request wait for a dummy pass; keep-alive
+            # passes also leave the idle timer alone
+            if not self._inference_lock.acquire(blocking=False):
+                continue
+            try:
+                self._run_model_locked([self._dummy_input])
+            except Exception as e:
+                logger.warning(f"YOLO keep-alive stopped: {str(e)}")
+                return
+            finally:
+                self._inference_lock.release()
+
+    def stop_keepalive(self):
+        self._keepalive_stop.set()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join()
+            self._keepalive_thread = None
+
+    def _allocate_inputs(self, batch_size: int):
+        import torch
+
+        input_shape = (batch_size, 1, YOLO_INPUT_SIZE, YOLO_INPUT_SIZE)
+
+        if self._stream is not None:
+            self._host_input = torch.empty(input_shape, dtype=torch.float16).pin_memory()
+            self._device_input = torch.empty(
+                (batch_size, 3, YOLO_INPUT_SIZE, YOLO_INPUT_SIZE),
+                dtype=torch.float16,
+                device=self.device,
+            )
+        else:
+            self._host_input = torch.empty(input_shape, dtype=torch.float16)
+
+    def _run_model(self, yolo_inputs: List[Dict[str, Any]]):
+        # The input buffers are shared, so one inference at a time
+        with self._inference_lock:
+            self._last_inference = time.monotonic()
+            return self._run_model_locked(yolo_inputs)
+
+    def _run_model_locked(self, yolo_inputs: List[Dict[str, Any]]):
+        import torch
+
+        batch_size = len(yolo_inputs)
+
+        # Grow the persistent buffers to the largest batch seen so far
+        if self._host_input.shape[0] < batch_size:
+            self._allocate_inputs(batch_size)
+
+        host_buffer = self._host_input.numpy()
+        for i, yolo_input in enumerate(yolo_inputs):
+            np.copyto(host_buffer[i : i + 1], yolo_input["tensor"])
+        host_input = self._host_input[:batch_size].expand(-1, 3, -1, -1)
+
+        if self._stream is None:
+            return self.model.predict(
+                host_input,
+                conf=self.confidence_threshold,
+                verbose=False,
+                imgsz=YOLO_INPUT_SIZE,
+                device=self.device,
+            )
 
-        if len(results) > 0:
-            result = results[0]  # First image result
+        with torch.cuda.stream(self._stream):
+            device_input = self._device_input[:batch_size]
+            device_input.copy_(host_input, non_blocking=True)
+            results = self.model.predict(
+                device_input,
+                conf=self.confidence_threshold,
+                verbose=False,
+                imgsz=YOLO_INPUT_SIZE,
+                device=self.device,
+                half=True,
+            )
+        self._stream.synchronize()
+
+        return results
+
+    def preprocess(self, image: np.ndarray) -> Dict[str, Any]:
+        # Histogram equalization + letterbox to the network input size. Only one
+        # channel is kept (the X-ray is grayscale); it is expanded to 3
+        # channels when copied into the model input buffer
+        height, width = image.shape[:2]
+        equalized = equalize_grayscale(image)
+        letterboxed, ratio, (pad_left, pad_top) = letterbox(equalized, YOLO_INPUT_SIZE)
+
+        return {
+            "tensor": to_input_tensor(letterboxed),
+            "ratio": ratio,
+            "pad": (pad_left, pad_top),
+            "shape": (height, width),
+        }
 
-            if result.boxes is not None and len(result.boxes) > 0:
-                boxes = result.boxes
+    def predict(
+        self, image: np.ndarray, yolo_input: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return self.predict_batch([image], [yolo_input])[0]
 
-                for box in boxes:
-                    # Extract detection data
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    bbox_xyxy = box.xyxy[0].cpu().numpy()  # [x1, y1, x2, y2]
+    def predict_batch(
+        self,
+        images: List[np.ndarray],
+        yolo_inputs: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        if not self.model_loaded:
+            raise RuntimeError(ERROR_MODEL_NOT_LOADED)
 
-                    # Get class name (English)
-                    class_name = self.model.names[class_id]
+        if yolo_inputs is None:
+            yolo_inputs = [None] * len(images)
 
-                    # Create detection dictionary
-                    detection = {
-                        "class_id": class_id,
-                        "class_name_en": class_name,
-                        "confidence": confidence,
-                        "bbox": {
-                            "x1": int(bbox_xyxy[0]),
-                            "y1": int(bbox_xyxy[1]),
-                            "x2": int(bbox_xyxy[2]),
-                            "y2": int(bbox_xyxy[3]),
-                        },
-                    }
+        # Reuse the tensors prepared at upload time when available
+        prepared = []
+        logger.opt(lazy=True).info(
+            "Inference - Images: {}",
+            lambda: ", ".join(f"{image.shape} {image.dtype}" for image in images),
+        )
+        for image, yolo_input in zip(images, yolo_inputs):
+            if yolo_input is None:
+                yolo_input = self.preprocess(image)
+            prepared.append(yolo_input)
+        logger.info(f"Preprocessed: {len(prepared)} x {prepared[0]['tensor'].shape}")
 
-                    detections.append(detection)
+        start_time = time.time()
+
+        # Input is already letterboxed and normalized, so YOLO runs it as-is;
+        # images go through in batches of up to max_batch_size per forward pass
+        all_detections = []
+        start = 0
+        while start < len(prepared):
+            chunk = prepared[start : start + self.max_batch_size]
+            try:
+                results = self._run_model(chunk)
+            except Exception as e:
+                if len(chunk) == 1:
+                    raise
+                # The model rejected the batch shape: run one image at a time
+                # from now on
+                logger.warning(
+                    f"Batch of {len(chunk)} failed ({str(e)}), falling back to batch size 1"
+                )
+                self.max_batch_size = 1
+                continue
+            for result, yolo_input in zip(results, chunk):
+                all_detections.append(self._parse_result(result, yolo_input))
+            start += len(chunk)
 
         inference_time_ms = int((time.time() - start_time) * 1000)
-        logger.info(f"Found {len(detections)} detections in {inference_time_ms}ms")
+        logger.info(
+            f"Found {sum(len(d) for d in all_detections)} detections in "
+            f"{len(all_detections)} image(s) in {inference_time_ms}ms"
+        )
+
+        return all_detections
+
+    def _parse_result(self, result, yolo_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        detections = []
+
+        if result.boxes is not None and len(result.boxes) > 0:
+            boxes = result.boxes
+
+            # A single device-to-host copy of the packed result rows
+            # (x1, y1, x2, y2, ..., conf, cls) for all boxes
+            data = boxes.data.cpu().numpy()
+
+            # Map boxes from letterboxed input back to original image pixels
+            height, width = yolo_input["shape"]
+            pad_left, pad_top = yolo_input["pad"]
+            xyxy = data[:, :4]
+            xyxy -= (pad_left, pad_top, pad_left, pad_top)
+            xyxy /= yolo_input["ratio"]
+            np.clip(xyxy[:, 0::2], 0, width, out=xyxy[:, 0::2])
+            np.clip(xyxy[:, 1::2], 0, height, out=xyxy[:, 1::2])
+
+            # tolist() yields Python ints/floats without per-element casts
+            class_ids = data[:, -1].astype(np.int32).tolist()
+            confidences = data[:, -2].tolist()
+            corners = xyxy.astype(np.int32).tolist()
+            names = self.model.names
+
+            detections = [
+                {
+                    "class_id": class_id,
+                    "class_name_en": names[class_id],
+                    "confidence": confidence,
+                    "bbox": {"x1": x1, "y1": y1, "x2": x2, "y2": y2},
+                }
+                for class_id, confidence, (x1, y1, x2, y2) in zip(
+                    class_ids, confidences, corners
+                )
+            ]
 
         return detections
 
@@ -159,10 +388,15 @@ class YOLODetector:
 
             enhanced_detections.append(enhanced_det)
 
-            logger.debug(
-                f"Enhanced detection: {class_name_en} -> {class_name_vi} "
-                f"(tier: {confidence_tier}, conf: {det['confidence']:.3f})"
-            )
+        # One aggregated line, only formatted when DEBUG is enabled
+        logger.opt(lazy=True).debug(
+            "Enhanced detections: {}",
+            lambda: "; ".join(
+                f"{det['class_name_en']} -> {det['class_name_vi']} "
+                f"(tier: {det['confidence_tier']}, conf: {det['confidence']:.3f})"
+                for det in enhanced_detections
+            ),
+        )
 
         return enhanced_detections
 
@@ -172,160 +406,118 @@ class YOLODetector:
         detections: List[Dict[str, Any]],
         draw_low_confidence: bool = False,
     ) -> np.ndarray:
-        # Convert to PIL for drawing
-        if len(image.shape) == 2:
-            # Grayscale to RGB
-            pil_image = Image.fromarray(image).convert("RGB")
-        else:
-            pil_image = Image.fromarray(image)
+        # Draw straight onto an RGB copy of the image in the scratch buffer
+        annotated_image = self._to_rgb_canvas(image)
+        height, width = annotated_image.shape[:2]
 
-        draw = ImageDraw.Draw(pil_image)
+        font_size = LABEL_FONT_SIZE
 
-        font = None
-        font_size = 48  # Even larger font for better visibility
-        font_paths = [
-            "C:/Windows/Fonts/arialuni.ttf",  # Arial Unicode MS (best for Vietnamese)
-            "C:/Windows/Fonts/arial.ttf",  # Arial
-            "C:/Windows/Fonts/segoeui.ttf",  # Segoe UI
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux fallback
+        # Skip low confidence if not drawing them
+        visible = [
+            det
+            for det in detections
+            if det["confidence_tier"] != "low" or draw_low_confidence
         ]
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                logger.debug(f"Loaded font: {font_path} with size {font_size}")
-                break
-            except:
-                continue
-        if font is None:
-            logger.warning("Could not load TrueType font, using default font")
-            font = ImageFont.load_default()
-
-        colors = {
-            "high": (255, 0, 0),  # Red for high confidence
-            "medium": (255, 165, 0),  # Orange for medium confidence
-            "low": (128, 128, 128),  # Gray for low confidence
-        }
-
-        for det in detections:
-            confidence_tier = det["confidence_tier"]
-
-            # Skip low confidence if not drawing them
-            if confidence_tier == "low" and not draw_low_confidence:
-                continue
 
+        # Boxes first (solid for high, dashed for medium) - T045. Dashes of
+        # every box with the same color go out in a single polylines call
+        dashed_segments: Dict[Tuple[int, int, int], List[np.ndarray]] = {}
+        for det in visible:
             bbox = det["bbox"]
-            color = colors.get(confidence_tier, (0, 255, 0))
+            color = _TIER_COLORS.get(det["confidence_tier"], (0, 255, 0))
 
-            # Draw box (solid for high, dashed for medium) - T045
-            if confidence_tier == "high":
+            if det["confidence_tier"] == "high":
                 # Solid box
-                draw.rectangle(
-                    [(bbox["x1"], bbox["y1"]), (bbox["x2"], bbox["y2"])],
-                    outline=color,
-                    width=3,
+                cv2.rectangle(
+                    annotated_image,
+                    (bbox["x1"], bbox["y1"]),
+                    (bbox["x2"], bbox["y2"]),
+                    color,
+                    3,
                 )
             else:
-                # Dashed box (draw segments)
-                self._draw_dashed_rectangle(
-                    draw,
-                    [(bbox["x1"], bbox["y1"]), (bbox["x2"], bbox["y2"])],
-                    outline=color,
-                    width=2,
-                    dash_length=10,
+                dashed_segments.setdefault(color, []).append(
+                    _dash_segments(bbox, dash_length=10)
                 )
 
+        for color, segments in dashed_segments.items():
+            segments = np.concatenate(segments)
+            if len(segments):
+                cv2.polylines(annotated_image, segments, False, color, 2)
+
+        # Labels on top, so no box line crosses another detection's label
+        num_drawn = 0
+        for det in visible:
+            bbox = det["bbox"]
+            color = _TIER_COLORS.get(det["confidence_tier"], (0, 255, 0))
+
             # Draw label with Vietnamese text - T045
             class_name_vi = det["class_name_vi"]
             confidence = det["confidence"]
             label = f"{class_name_vi} {confidence:.0%}"
 
             # Calculate text position with padding
-            text_padding = 8
             label_x = bbox["x1"]
-            label_y = bbox["y1"] - font_size - text_padding * 2
+            label_y = bbox["y1"] - font_size - _LABEL_PADDING * 2
 
             # If label goes above image, put it below the top of bbox
             if label_y < 0:
                 label_y = bbox["y1"] + 5
 
-            # Background for text with padding
-            bbox_text = draw.textbbox(
-                (label_x + text_padding, label_y + text_padding), label, font=font
+            patch, offset_x, offset_y = _render_label(label, color)
+            _paste_clipped(
+                annotated_image, patch, label_x + offset_x, label_y + offset_y
             )
-            # Expand background box for padding
-            background_box = [
-                bbox_text[0] - text_padding,
-                bbox_text[1] - text_padding,
-                bbox_text[2] + text_padding,
-                bbox_text[3] + text_padding,
-            ]
-            draw.rectangle(background_box, fill=color)
+            num_drawn += 1
 
-            # Draw text in yellow with bold effect (draw multiple times slightly offset)
-            text_pos = (label_x + text_padding, label_y + text_padding)
-            # Draw shadow for better readability
-            draw.text(
-                (text_pos[0] + 2, text_pos[1] + 2), label, fill=(0, 0, 0), font=font
-            )
-            # Draw main text in yellow
-            draw.text(text_pos, label, fill=(255, 255, 0), font=font)
-
-        # Convert back to numpy
-        annotated_image = np.array(pil_image)
-
-        logger.info(
-            f"Drew {len([d for d in detections if d['confidence_tier'] != 'low' or draw_low_confidence])} bounding boxes"
-        )
+        logger.info(f"Drew {num_drawn} bounding boxes")
 
         return annotated_image
 
-    def _draw_dashed_rectangle(self, draw, coords, outline, width=1, dash_length=10):
-        x1, y1 = coords[0]
-        x2, y2 = coords[1]
-
-        # Top edge
-        for x in range(x1, x2, dash_length * 2):
-            draw.line(
-                [(x, y1), (min(x + dash_length, x2), y1)], fill=outline, width=width
-            )
-
-        # Bottom edge
-        for x in range(x1, x2, dash_length * 2):
-            draw.line(
-                [(x, y2), (min(x + dash_length, x2), y2)], fill=outline, width=width
-            )
+    def _to_rgb_canvas(self, image: np.ndarray) -> np.ndarray:
+        canvas = self._annotation_buffer(*image.shape[:2])
+        if len(image.shape) == 2:
+            # Replicate grayscale into all three channels (much faster than a
+            # NumPy broadcast assignment)
+            cv2.cvtColor(image, cv2.COLOR_GRAY2RGB, dst=canvas)
+        else:
+            np.copyto(canvas, image[..., :3])
+        return canvas
 
-        # Left edge
-        for y in range(y1, y2, dash_length * 2):
-            draw.line(
-                [(x1, y), (x1, min(y + dash_length, y2))], fill=outline, width=width
-            )
+    def _annotation_buffer(self, height: int, width: int) -> np.ndarray:
+        # Flat buffer that only grows, so the returned view is always contiguous.
+        # Thread-local: the view stays valid until this thread annotates again,
+        # i.e. after the caller has encoded it
+        size = height * width * 3
+        buffer = getattr(self._scratch, "buffer", None)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=np.uint8)
+            self._scratch.buffer = buffer
 
-        # Right edge
-        for y in range(y1, y2, dash_length * 2):
-            draw.line(
-                [(x2, y), (x2, min(y + dash_length, y2))], fill=outline, width=width
-            )
+        return buffer[:size].reshape(height, width, 3)
 
     def detect_and_annotate(
-        self, image: np.ndarray
+        self, image: np.ndarray, yolo_input: Optional[Dict[str, Any]] = None
     ) -> Tuple[np.ndarray, List[Dict[str, Any]], bool]:
         if not self.model_loaded:
             self.load_model()
 
         # Run detection
-        detections = self.predict(image)
+        detections = self.predict(image, yolo_input=yolo_input)
 
+        return self.annotate(image, detections)
+
+    def annotate(
+        self, image: np.ndarray, detections: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]], bool]:
         # Check if normal (no detections above threshold)
         is_normal = len(detections) == 0
 
         if is_normal:
             logger.info("No abnormalities detected")
-            if len(image.shape) == 2:
-                annotated_image = np.stack([image] * 3, axis=-1)
-            else:
-                annotated_image = image.copy()
-            return annotated_image, [], True
+            # Nothing to draw: hand back the grayscale image itself (no RGB
+            # copy); it encodes as a smaller single-channel JPEG
+            return image, [], True
 
         # Add Vietnamese labels + health info
         detections = self.add_vietnamese_labels_and_health_info(detections)
@@ -338,6 +530,202 @@ class YOLODetector:
         return annotated_image, detections, False
 
 
+# Box and label background colors per confidence tier
+_TIER_COLORS = {
+    "high": (255, 0, 0),  # Red for high confidence
+    "medium": (255, 165, 0),  # Orange for medium confidence
+    "low": (128, 128, 128),  # Gray for low confidence
+}
+
+# Padding between the label text and its background box
+_LABEL_PADDING = 8
+
+
+@lru_cache(maxsize=1)
+def _load_label_font() -> ImageFont.FreeTypeFont:
+    font_paths = [
+        "C:/Windows/Fonts/arialuni.ttf",  # Arial Unicode MS (best for Vietnamese)
+        "C:/Windows/Fonts/arial.ttf",  # Arial
+        "C:/Windows/Fonts/segoeui.ttf",  # Segoe UI
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux fallback
+    ]
+    for font_path in font_paths:
+        try:
+            font = ImageFont.truetype(font_path, LABEL_FONT_SIZE)
+            logger.debug(f"Loaded font: {font_path} with size {LABEL_FONT_SIZE}")
+            return font
+        except OSError:
+            continue
+
+    logger.warning("Could not load TrueType font, using default font")
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=512)
+def _render_label(
+    label: str, color: Tuple[int, int, int]
+) -> Tuple[np.ndarray, int, int]:
+    # Labels repeat across requests (class name + rounded confidence), so the
+    # rendered patch is cached. Returns the read-only RGB patch and its offset
+    # from the label anchor
+    font = _load_label_font()
+
+    # Background box around the text, expanded for padding
+    left, top, right, bottom = font.getbbox(label)
+    box_x1 = left
+    box_y1 = top
+    box_x2 = _LABEL_PADDING + right + _LABEL_PADDING
+    box_y2 = _LABEL_PADDING + bottom + _LABEL_PADDING
+
+    # Only the label patch goes through PIL (cv2 cannot render Vietnamese)
+    patch = Image.new("RGB", (box_x2 - box_x1 + 1, box_y2 - box_y1 + 1), color)
+    draw = ImageDraw.Draw(patch)
+    text_pos = (_LABEL_PADDING - box_x1, _LABEL_PADDING - box_y1)
+    # Draw shadow for better readability
+    draw.text((text_pos[0] + 2, text_pos[1] + 2), label, fill=(0, 0, 0), font=font)
+    # Draw main text in yellow
+    draw.text(text_pos, label, fill=(255, 255, 0), font=font)
+
+    array = np.asarray(patch)
+    array.setflags(write=False)
+    return array, box_x1, box_y1
+
+
+def _dash_segments(bbox: Dict[str, int], dash_length: int) -> np.ndarray:
+    # (N, 2, 2) array of dash start/end points along the four box edges
+    x1, y1, x2, y2 = bbox["x1"], bbox["y1"], bbox["x2"], bbox["y2"]
+
+    xs = np.arange(x1, x2, dash_length * 2)
+    x_ends = np.minimum(xs + dash_length, x2)
+    ys = np.arange(y1, y2, dash_length * 2)
+    y_ends = np.minimum(ys + dash_length, y2)
+
+    segments = []
+    for y in (y1, y2):  # Top and bottom edges
+        y_col = np.full_like(xs, y)
+        segments.append(np.stack([xs, y_col, x_ends, y_col], axis=-1))
+    for x in (x1, x2):  # Left and right edges
+        x_col = np.full_like(ys, x)
+        segments.append(np.stack([x_col, ys, x_col, y_ends], axis=-1))
+
+    return np.concatenate(segments).reshape(-1, 2, 2).astype(np.int32)
+
+
+def _paste_clipped(canvas: np.ndarray, patch: np.ndarray, x: int, y: int) -> None:
+    height, width = canvas.shape[:2]
+    patch_height, patch_width = patch.shape[:2]
+
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + patch_width, width), min(y + patch_height, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    canvas[y0:y1, x0:x1] = patch[y0 - y : y1 - y, x0 - x : x1 - x]
+
+
+def _engine_max_batch_size(engine_path: Path) -> int:
+    # Ultralytics prefixes exported engines with their export metadata: a
+    # little-endian uint32 length followed by that many bytes of JSON. Only an
+    # engine exported with a dynamic batch takes batches smaller than its own
+    try:
+        with open(engine_path, "rb") as f:
+            meta_len = int.from_bytes(f.read(4), byteorder="little")
+            metadata = json.loads(f.read(meta_len).decode("utf-8"))
+    except (OSError, UnicodeDecodeError, ValueError):
+        logger.warning(f"No export metadata in {engine_path}, assuming batch size 1")
+        return 1
+
+    if not isinstance(metadata, dict) or not metadata.get("args", {}).get("dynamic"):
+        return 1
+
+    return max(1, min(int(metadata.get("batch", 1)), YOLO_MAX_BATCH_SIZE))
+
+
+def export_tensorrt_engine(weights_path: Path = MODEL_WEIGHTS_PATH) -> Path:
+    from ultralytics import YOLO
+
+    logger.info(f"Exporting {weights_path} to TensorRT FP16 engine...")
+    start_time = time.time()
+
+    # Optimized for the inference size with a dynamic batch of up to
+    # YOLO_MAX_BATCH_SIZE, so coalesced requests run in one engine execution
+    engine_path = YOLO(str(weights_path)).export(
+        format="engine",
+        half=True,
+        imgsz=YOLO_INPUT_SIZE,
+        dynamic=True,
+        batch=YOLO_MAX_BATCH_SIZE,
+        simplify=True,
+        workspace=YOLO_ENGINE_WORKSPACE_GB,
+    )
+
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    logger.success(f"TensorRT engine written to {engine_path} in {elapsed_ms}ms")
+
+    return Path(engine_path)
+
+
+def export_torchscript_model(weights_path: Path = MODEL_WEIGHTS_PATH) -> Path:
+    from ultralytics import YOLO
+
+    logger.info(f"Exporting {weights_path} to TorchScript...")
+    start_time = time.time()
+
+    # Traced once at a static inference size; runs without the Python module
+    # graph on both CPU and GPU (FP16 is applied at load time on CUDA)
+    model_path = YOLO(str(weights_path)).export(
+        format="torchscript",
+        imgsz=YOLO_INPUT_SIZE,
+        dynamic=False,
+    )
+
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    logger.success(f"TorchScript model written to {model_path} in {elapsed_ms}ms")
+
+    return Path(model_path)
+
+
+def export_int8_model(data_path: Path, weights_path: Path = MODEL_WEIGHTS_PATH) -> Path:
+    import shutil
+
+    import torch
+    from ultralytics import YOLO
+
+    # TensorRT INT8 on NVIDIA GPUs (incl. Jetson), OpenVINO INT8 on CPU
+    if torch.cuda.is_available():
+        export_format, target_path = "engine", MODEL_INT8_ENGINE_PATH
+    else:
+        export_format, target_path = "openvino", MODEL_OPENVINO_INT8_PATH
+
+    logger.info(f"Exporting {weights_path} to {export_format} INT8, calibrating on {data_path}...")
+    start_time = time.time()
+
+    # Post-training quantization: activation ranges are calibrated on the
+    # dataset images at the static inference size
+    export_kwargs = {"workspace": YOLO_ENGINE_WORKSPACE_GB} if export_format == "engine" else {}
+    exported_path = YOLO(str(weights_path)).export(
+        format=export_format,
+        int8=True,
+        data=str(data_path),
+        imgsz=YOLO_INPUT_SIZE,
+        dynamic=False,
+        **export_kwargs,
+    )
+
+    # Ultralytics writes next to the weights, where the FP16 engine also lives
+    if target_path.exists():
+        if target_path.is_dir():
+            shutil.rmtree(target_path)
+        else:
+            target_path.unlink()
+    shutil.move(str(exported_path), str(target_path))
+
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    logger.success(f"INT8 model written to {target_path} in {elapsed_ms}ms")
+
+    return target_path
+
+
 _detector_instance = None
 
 
@@ -346,10 +734,28 @@ def get_detector() -> YOLODetector:
     global _detector_instance
 
     if _detector_instance is None:
-        _detector_instance = YOLODetector()
+        # With YOLO_PRECISION=int8 prefer an INT8 export; otherwise the
+        # TensorRT engine, then TorchScript when exported, else PyTorch weights
+        if YOLO_PRECISION == "int8" and MODEL_INT8_ENGINE_PATH.exists():
+            model_path = MODEL_INT8_ENGINE_PATH
+        elif YOLO_PRECISION == "int8" and MODEL_OPENVINO_INT8_PATH.exists():
+            model_path = MODEL_OPENVINO_INT8_PATH
+        elif MODEL_ENGINE_PATH.exists():
+            model_path = MODEL_ENGINE_PATH
+        elif MODEL_TORCHSCRIPT_PATH.exists():
+            model_path = MODEL_TORCHSCRIPT_PATH
+        else:
+            model_path = MODEL_WEIGHTS_PATH
+        _detector_instance = YOLODetector(model_path=model_path)
         logger.info("Created new YOLODetector singleton instance")
 
     return _detector_instance
 
 
-__all__ = ["YOLODetector", "get_detector"]
+__all__ = [
+    "YOLODetector",
+    "get_detector",
+    "export_tensorrt_engine",
+    "export_torchscript_model",
+    "export_int8_model",
+]
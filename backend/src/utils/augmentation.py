@@ -1,29 +1,125 @@
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+import cv2
 import numpy as np
-import random
-from typing import Tuple
 
-from backend.src.filters.gaussian import apply_gaussian
+# Augmentation blur is always this sigma with a 3x3 or 5x5 kernel
+_BLUR_SIGMA = 0.5
+
+# Used when the caller passes no generator; pass a seeded
+# np.random.default_rng(seed) for reproducible augmentation
+_default_rng = np.random.default_rng()
 
 
 def augment_image(
     img_array: np.ndarray,
     augmentation_probability: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
 ) -> np.ndarray:
+    rng = rng or _default_rng
 
-    if random.random() < augmentation_probability:
-        img_array = _apply_dynamic_gaussian_blur(img_array)
+    if rng.random() < augmentation_probability:
+        img_array = _apply_dynamic_gaussian_blur(img_array, rng)
 
     return img_array
 
 
-def _apply_dynamic_gaussian_blur(img_array: np.ndarray) -> np.ndarray:
+def augment_batch(
+    images: np.ndarray,
+    augmentation_probability: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    # Same distribution as augment_image: the augment/kernel-size draws for
+    # an (N, H, W) stack are vectorized, then each selected image is blurred
+    # with one OpenCV call (far cheaper than a NumPy pass over the stack)
+    rng = rng or _default_rng
+    count = len(images)
+    augmented = rng.random(count) < augmentation_probability
+    kernel_sizes = np.where(rng.random(count) < 0.80, 3, 5)
+
+    result = images.copy()
+    for i in np.flatnonzero(augmented):
+        result[i] = _gaussian_blur(images[i], int(kernel_sizes[i]))
+
+    return result
+
+
+def make_augmenter(
+    shape: Tuple[int, int],
+    dtype=np.uint8,
+    augmentation_probability: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
+) -> Callable[[np.ndarray], np.ndarray]:
+    # augment_image specialized for one image shape, for loaders that call it
+    # per sample: kernels are looked up once and the float32 blur and the
+    # uint8 result reuse preallocated buffers, so a blurred result is only
+    # valid until the next call. One augmenter per worker (not thread-safe)
+    shape = tuple(shape)
+    dtype = np.dtype(dtype)
+    # The blur is clipped to the 0-255 range, which only fits 8-bit images
+    if dtype != np.uint8:
+        raise ValueError(f"Augmenter supports uint8 images only, got {dtype}")
+    rng = rng or _default_rng
+    kernels = {kernel_size: _blur_kernel(kernel_size) for kernel_size in (3, 5)}
+    scratch = np.empty(shape, dtype=np.float32)
+    output = np.empty(shape, dtype=dtype)
+
+    def augment(img_array: np.ndarray) -> np.ndarray:
+        # OpenCV would silently allocate a new output for any other input
+        if img_array.shape != shape or img_array.dtype != dtype:
+            raise ValueError(
+                f"Augmenter built for {shape} {dtype}, "
+                f"got {img_array.shape} {img_array.dtype}"
+            )
+
+        if rng.random() >= augmentation_probability:
+            return img_array
+
+        kernel = kernels[3] if rng.random() < 0.80 else kernels[5]
+        blurred = cv2.sepFilter2D(
+            img_array,
+            cv2.CV_32F,
+            kernel,
+            kernel,
+            dst=scratch,
+            borderType=cv2.BORDER_REFLECT_101,
+        )
+        np.clip(blurred, 0, 255, out=blurred)
+        # Truncating cast into the reused output, like astype(np.uint8)
+        np.copyto(output, blurred, casting="unsafe")
+        return output
+
+    return augment
+
+
+def _apply_dynamic_gaussian_blur(
+    img_array: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
 
-    rand = random.random()
+    rand = rng.random()
 
     if rand < 0.80:  # 80% chance
         kernel_size = 3
     else:  # 20% chance (0.80–1.00)
         kernel_size = 5
 
-    sigma = 0.5
-    return apply_gaussian(img_array, kernel_size=kernel_size, sigma=sigma)
+    return _gaussian_blur(img_array, kernel_size)
+
+
+@lru_cache(maxsize=2)
+def _blur_kernel(kernel_size: int) -> np.ndarray:
+    # Same normalized taps as the Gaussian filter's kernel for this sigma
+    return cv2.getGaussianKernel(kernel_size, _BLUR_SIGMA, cv2.CV_32F)
+
+
+def _gaussian_blur(img_array: np.ndarray, kernel_size: int) -> np.ndarray:
+    # Specialized for the fixed augmentation sigma: OpenCV's SIMD separable
+    # filter in float32, truncated to uint8 like apply_gaussian (at most 1
+    # level apart on rounding ties)
+    kernel = _blur_kernel(kernel_size)
+    blurred = cv2.sepFilter2D(
+        img_array, cv2.CV_32F, kernel, kernel, borderType=cv2.BORDER_REFLECT_101
+    )
+    np.clip(blurred, 0, 255, out=blurred)
+    return blurred.astype(np.uint8)
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.src.utils.logging_config import logger
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent async calls into one call of a blocking batch function.
+
+    The first pending item starts a `window_ms` timer; every item submitted
+    before it fires (or until `max_batch_size` items are pending) joins the
+    same batch. `batch_fn` receives the list of items in a worker thread and
+    must return one result per item, in order.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        window_ms: float,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references so running batches are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        logger.debug(f"Running coalesced batch of {len(batch)}")
+        try:
+            results = await run_in_threadpool(self.batch_fn, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Callers that went away (cancelled requests) are skipped
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
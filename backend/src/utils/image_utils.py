@@ -1,10 +1,15 @@
+import base64
 import io
+
+import cv2
 import numpy as np
 from PIL import Image
 
 from backend.src.config.settings import (
+    JPEG_QUALITY,
     MAX_IMAGE_DIMENSION,
     MIN_IMAGE_DIMENSION,
+    PNG_COMPRESSION_LEVEL,
     ERROR_CORRUPTED_IMAGE,
     ERROR_IMAGE_TOO_SMALL,
     ERROR_IMAGE_TOO_LARGE,
@@ -14,16 +19,27 @@ from backend.src.config.settings import (
 def load_image_from_bytes(image_bytes: bytes) -> Image.Image:
 
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        # Verify image can be loaded
-        image.verify()
-        # Reopen after verify (verify closes the file)
-        image = Image.open(io.BytesIO(image_bytes))
-        return image
+        # Only the header is parsed here (format, size, mode); pixel data is
+        # decoded separately by decode_grayscale()
+        return Image.open(io.BytesIO(image_bytes))
     except Exception as e:
         raise ValueError(f"{ERROR_CORRUPTED_IMAGE}: {str(e)}")
 
 
+def decode_grayscale(image_bytes: bytes) -> np.ndarray:
+
+    # Decode straight into a uint8 array; EXIF orientation is ignored to
+    # match the pixels PIL would return
+    array = cv2.imdecode(
+        np.frombuffer(image_bytes, dtype=np.uint8),
+        cv2.IMREAD_GRAYSCALE | cv2.IMREAD_IGNORE_ORIENTATION,
+    )
+    if array is None:
+        raise ValueError(f"{ERROR_CORRUPTED_IMAGE}: decoder returned no data")
+
+    return array
+
+
 def validate_image_dimensions(image: Image.Image) -> None:
 
     width, height = image.size
@@ -61,6 +77,18 @@ def numpy_to_pil(array: np.ndarray) -> Image.Image:
         raise ValueError(f"Invalid array shape: {array.shape}")
 
 
+def downscale_to_max_side(array: np.ndarray, max_side: int) -> np.ndarray:
+
+    height, width = array.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return array
+
+    # INTER_AREA averages source pixels, avoiding aliasing when shrinking
+    new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(array, new_size, interpolation=cv2.INTER_AREA)
+
+
 def normalize_to_uint8(array: np.ndarray) -> np.ndarray:
 
     array_min = array.min()
@@ -78,8 +106,6 @@ def normalize_to_uint8(array: np.ndarray) -> np.ndarray:
 
 def pil_to_base64(image: Image.Image, format: str = "PNG") -> str:
 
-    import base64
-
     buffer = io.BytesIO()
     image.save(buffer, format=format)
     buffer.seek(0)
@@ -87,10 +113,33 @@ def pil_to_base64(image: Image.Image, format: str = "PNG") -> str:
     return base64.b64encode(buffer.getvalue()).decode("utf-8")
 
 
+def numpy_to_bytes(array: np.ndarray, format: str = "PNG") -> bytes:
+
+    if array.dtype != np.uint8:
+        array = normalize_to_uint8(array)
+
+    if array.ndim == 3:
+        # OpenCV expects BGR channel order
+        array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+    elif array.ndim != 2:
+        raise ValueError(f"Invalid array shape: {array.shape}")
+
+    if format.upper() in ("JPEG", "JPG"):
+        ok, buffer = cv2.imencode(".jpg", array, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    else:
+        ok, buffer = cv2.imencode(
+            ".png", array, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION_LEVEL]
+        )
+
+    if not ok:
+        raise ValueError(f"Failed to encode image as {format}")
+
+    return buffer.tobytes()
+
+
 def numpy_to_base64(array: np.ndarray, format: str = "PNG") -> str:
 
-    image = numpy_to_pil(array)
-    return pil_to_base64(image, format)
+    return base64.b64encode(numpy_to_bytes(array, format)).decode("ascii")
 
 
 def get_image_info(image: Image.Image) -> dict:
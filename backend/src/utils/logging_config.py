@@ -7,6 +7,7 @@ from backend.src.config.settings import (
     LOG_RETENTION,
     LOG_LEVEL,
     LOG_FORMAT,
+    ACCESS_LOG_FILE,
 )
 
 
@@ -19,6 +20,7 @@ def setup_logging() -> None:
         format=LOG_FORMAT,
         level=LOG_LEVEL,
         colorize=True,
+        enqueue=True,  # Write from a background thread, off the event loop
     )
 
     LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,6 +36,19 @@ def setup_logging() -> None:
         enqueue=True,  # Thread-safe logging
     )
 
+    # One JSON object per access record, with method/path/status/duration_ms
+    # as structured fields for log aggregation
+    logger.add(
+        LOG_DIR / ACCESS_LOG_FILE,
+        level="INFO",
+        filter=lambda record: record["extra"].get("access", False),
+        serialize=True,
+        rotation=LOG_ROTATION,
+        retention=LOG_RETENTION,
+        compression="zip",
+        enqueue=True,
+    )
+
     logger.info("Logging configured successfully")
     logger.info(f"Log directory: {LOG_DIR}")
     logger.info(f"Log rotation: {LOG_ROTATION}, retention: {LOG_RETENTION}")
@@ -1,12 +1,21 @@
+from typing import Tuple
+
+import cv2
 import numpy as np
 from PIL import Image
 
 from backend.src.filters.histogram import apply_histogram_equalization
 
+# uint8 -> [0, 1] fp16 lookup table, so normalization is a single gather pass
+_UINT8_TO_UNIT_FP16 = np.arange(256, dtype=np.float16) / np.float16(255)
 
-def preprocess_image(image: np.ndarray) -> np.ndarray:
+
+def equalize_grayscale(image: np.ndarray) -> np.ndarray:
     if len(image.shape) == 3:
-        image = np.dot(image[..., :3], [0.299, 0.587, 0.114]).astype(np.uint8)
+        if image.dtype == np.uint8:
+            image = _rgb_to_gray_uint8(image)
+        else:
+            image = np.dot(image[..., :3], [0.299, 0.587, 0.114]).astype(np.uint8)
 
     if image.dtype != np.uint8:
         img_min, img_max = image.min(), image.max()
@@ -15,9 +24,55 @@ def preprocess_image(image: np.ndarray) -> np.ndarray:
         else:
             image = np.zeros_like(image, dtype=np.uint8)
 
-    image = apply_histogram_equalization(image)
+    return apply_histogram_equalization(image)
+
+
+def _rgb_to_gray_uint8(image: np.ndarray) -> np.ndarray:
+    # BT.601 luma in 8-bit fixed point, (77 R + 150 G + 29 B) >> 8: uint16
+    # accumulation (at most 255 * 256) instead of a float64 dot product,
+    # within one gray level of it. Channels are widened explicitly: NumPy 1.x
+    # value-based casting would keep uint8 * scalar in uint8 and overflow
+    gray = image[..., 0].astype(np.uint16) * 77
+    gray += image[..., 1].astype(np.uint16) * 150
+    gray += image[..., 2].astype(np.uint16) * 29
+    gray >>= 8
+    return gray.astype(np.uint8)
+
+
+def preprocess_image(image: np.ndarray) -> np.ndarray:
+    image = equalize_grayscale(image)
 
     # Convert grayscale to RGB by replicating channels (YOLO expects 3 channels)
     image = np.stack([image] * 3, axis=-1)
 
     return image
+
+
+def letterbox(
+    image: np.ndarray, size: int, pad_value: int = 114
+) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    # Same geometry as the Ultralytics letterbox: scale to fit, pad to a square
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+
+    if (new_width, new_height) != (width, height):
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    pad_w, pad_h = (size - new_width) / 2, (size - new_height) / 2
+    top, bottom = round(pad_h - 0.1), round(pad_h + 0.1)
+    left, right = round(pad_w - 0.1), round(pad_w + 0.1)
+
+    image = cv2.copyMakeBorder(
+        image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=pad_value
+    )
+
+    return image, ratio, (left, top)
+
+
+def to_input_tensor(image: np.ndarray) -> np.ndarray:
+    # Cast, /255 and HW -> NCHW in one pass straight into the output buffer
+    tensor = np.empty((1, 1) + image.shape, dtype=np.float16)
+    np.take(_UINT8_TO_UNIT_FP16, image, out=tensor[0, 0])
+
+    return tensor
@@ -0,0 +1,199 @@
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from backend.src.utils.logging_config import logger
+
+# DELETE/UPDATE ... RETURNING in the queries
+_MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Bumped when the table layout changes; stored entries are disposable, so an
+# older database is simply recreated
+_SCHEMA_VERSION = 2
+
+
+def _split_arrays(value: Dict[str, Any], prefix: tuple = ()) -> Tuple[dict, dict]:
+    # Separate numpy arrays (at any dict depth) from the remaining fields
+    fields, arrays = {}, {}
+    for k, v in value.items():
+        if isinstance(v, np.ndarray):
+            arrays[prefix + (k,)] = v
+        elif isinstance(v, dict):
+            fields[k], nested = _split_arrays(v, prefix + (k,))
+            arrays.update(nested)
+        else:
+            fields[k] = v
+    return fields, arrays
+
+
+class SharedImageStore:
+    """
+    Image storage shared by every worker process on the host.
+
+    Entries live in a SQLite database: numpy arrays (including inside nested
+    dicts) as raw BLOBs next to their shape and dtype, the remaining fields
+    pickled. Any worker can read an entry written by another, and nothing is
+    held open per entry, so a crashed worker leaks nothing. Entries expire
+    after `ttl` seconds of inactivity and the least recently used entries are
+    evicted beyond `maxsize`.
+
+    Arrays returned by `get` are read-only views of the fetched BLOBs.
+    Requires SQLite >= 3.35.
+    """
+
+    def __init__(self, db_path: Path, maxsize: int, ttl: float):
+        if sqlite3.sqlite_version_info < _MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"SharedImageStore requires SQLite >= 3.35 (RETURNING), "
+                f"found {sqlite3.sqlite_version}"
+            )
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.RLock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(db_path), timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        with self._transaction():
+            (version,) = self._db.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                self._db.execute("DROP TABLE IF EXISTS arrays")
+                self._db.execute("DROP TABLE IF EXISTS entries")
+                self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, fields BLOB, expires_at REAL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS arrays ("
+            "key TEXT REFERENCES entries (key) ON DELETE CASCADE, "
+            "path BLOB, shape BLOB, dtype TEXT, data BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS arrays_key ON arrays (key)")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # One write transaction, so other workers never see an entry without
+        # its arrays
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _delete_where(self, condition: str, params: tuple) -> int:
+        # Array rows follow through ON DELETE CASCADE
+        rows = self._db.execute(
+            f"DELETE FROM entries WHERE {condition} RETURNING key", params
+        ).fetchall()
+        for (key,) in rows:
+            logger.info(f"Cleaned up stored image: {key}")
+        return len(rows)
+
+    def expire(self) -> None:
+        with self._lock:
+            self._delete_where("expires_at <= ?", (time.time(),))
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._transaction():
+            now = time.time()
+            self._delete_where("expires_at <= ?", (now,))
+
+            # Refresh expiry on access
+            row = self._db.execute(
+                "UPDATE entries SET expires_at = ? WHERE key = ? RETURNING fields",
+                (now + self.ttl, str(key)),
+            ).fetchone()
+            if row is None:
+                return default
+
+            value = pickle.loads(row[0])
+            for path, shape, dtype, data in self._db.execute(
+                "SELECT path, shape, dtype, data FROM arrays WHERE key = ?", (str(key),)
+            ):
+                target = value
+                path = pickle.loads(path)
+                for k in path[:-1]:
+                    target = target[k]
+                # frombuffer over bytes is zero-copy and read-only
+                target[path[-1]] = np.frombuffer(data, dtype=dtype).reshape(
+                    pickle.loads(shape)
+                )
+            return value
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Dict[str, Any]) -> None:
+        fields, arrays = _split_arrays(value)
+
+        with self._transaction():
+            now = time.time()
+            self._delete_where("expires_at <= ? OR key = ?", (now, str(key)))
+            self._db.execute(
+                "INSERT INTO entries VALUES (?, ?, ?)",
+                (str(key), pickle.dumps(fields), now + self.ttl),
+            )
+            self._db.executemany(
+                "INSERT INTO arrays VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        str(key),
+                        pickle.dumps(path),
+                        pickle.dumps(array.shape),
+                        array.dtype.str,
+                        # Contiguous arrays are bound as BLOBs without a copy
+                        memoryview(np.ascontiguousarray(array)).cast("B"),
+                    )
+                    for path, array in arrays.items()
+                ),
+            )
+
+            # Evict least recently used entries beyond capacity
+            self._delete_where(
+                "key IN (SELECT key FROM entries ORDER BY expires_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            if not self._delete_where("key = ?", (str(key),)):
+                raise KeyError(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM entries WHERE key = ? AND expires_at > ?",
+                (str(key), time.time()),
+            ).fetchone()
+            return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM entries WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+            return count
+
+
+_MISSING = object()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from backend.src.utils.augmentation import (
+    _gaussian_blur,
+    augment_batch,
+    augment_image,
+    make_augmenter,
+)
+
+
+def _images(count: int = 6, shape=(32, 24)) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (count, *shape), dtype=np.uint8)
+
+
+def test_seeded_generator_makes_augmentation_reproducible():
+    images = _images()
+
+    np.testing.assert_array_equal(
+        augment_batch(images, rng=np.random.default_rng(42)),
+        augment_batch(images, rng=np.random.default_rng(42)),
+    )
+
+    first, second = np.random.default_rng(42), np.random.default_rng(42)
+    for image in images:
+        np.testing.assert_array_equal(
+            augment_image(image, rng=first), augment_image(image, rng=second)
+        )
+
+
+def test_augmenter_follows_the_given_generator():
+    image = _images(1)[0]
+    augment = make_augmenter(image.shape, rng=np.random.default_rng(7))
+    again = make_augmenter(image.shape, rng=np.random.default_rng(7))
+
+    for _ in range(10):
+        np.testing.assert_array_equal(augment(image), again(image))
+
+
+def test_probability_zero_and_one():
+    images = _images()
+    rng = np.random.default_rng(0)
+
+    np.testing.assert_array_equal(augment_batch(images, 0.0, rng=rng), images)
+    blurred = augment_batch(images, 1.0, rng=rng)
+    assert all((b != i).any() for b, i in zip(blurred, images))
+
+
+def test_augmenter_writes_into_its_output_buffer():
+    image = _images(1)[0]
+    augment = make_augmenter(image.shape, augmentation_probability=1.0)
+
+    first = augment(image)
+    blurred = first.copy()
+    second = augment(image)
+
+    assert first.dtype == np.uint8
+    assert np.shares_memory(first, second)
+    # Same values as the allocating blur with one of the two kernel sizes
+    assert any(
+        np.array_equal(blurred, _gaussian_blur(image, kernel_size)) for kernel_size in (3, 5)
+    )
+
+
+def test_augmenter_rejects_other_dtypes():
+    with pytest.raises(ValueError):
+        make_augmenter((8, 8), dtype=np.float32)
+
+    augment = make_augmenter((8, 8))
+    with pytest.raises(ValueError):
+        augment(np.zeros((8, 8), dtype=np.uint16))
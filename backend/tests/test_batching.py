@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.src.utils.batching import MicroBatcher
+
+
+def _recording_batch_fn(batches: list):
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    return batch_fn
+
+
+def test_concurrent_submits_share_one_batch():
+    batches = []
+    batcher = MicroBatcher(_recording_batch_fn(batches), max_batch_size=8, window_ms=50)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(main()) == [0, 10, 20, 30, 40]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_window():
+    batches = []
+    batcher = MicroBatcher(_recording_batch_fn(batches), max_batch_size=2, window_ms=60_000)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=5
+        )
+
+    assert asyncio.run(main()) == [0, 10, 20, 30]
+    assert batches == [[0, 1], [2, 3]]
+
+
+def test_batch_function_runs_off_the_event_loop():
+    threads = []
+
+    def batch_fn(items):
+        threads.append(threading.get_ident())
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, window_ms=1)
+
+    async def main():
+        await batcher.submit(1)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert len(threads) == 1
+    assert threads[0] != loop_thread
+
+
+def test_batch_error_reaches_every_caller():
+    def batch_fn(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, window_ms=10)
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert len(results) == 3
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_caller_does_not_break_the_batch():
+    batches = []
+    batcher = MicroBatcher(_recording_batch_fn(batches), max_batch_size=8, window_ms=20)
+
+    async def main():
+        abandoned = asyncio.ensure_future(batcher.submit(1))
+        kept = asyncio.ensure_future(batcher.submit(2))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+        return await kept
+
+    assert asyncio.run(main()) == 20
+    assert batches == [[1, 2]]
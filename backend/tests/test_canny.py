@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from backend.src.filters.canny import (
+    _auto_threshold,
+    _compute_gradients,
+    _gaussian_blur,
+    _non_maximum_suppression,
+)
+
+
+def _reference_nms(magnitude: np.ndarray, direction: np.ndarray) -> np.ndarray:
+    # The original per-pixel loop
+    h, w = magnitude.shape
+    suppressed = np.zeros_like(magnitude)
+    angle = np.degrees(direction) % 180
+
+    for i in range(1, h - 1):
+        for j in range(1, w - 1):
+            q = r = 255
+            if (0 <= angle[i, j] < 22.5) or (157.5 <= angle[i, j] <= 180):
+                q, r = magnitude[i, j + 1], magnitude[i, j - 1]
+            elif 22.5 <= angle[i, j] < 67.5:
+                q, r = magnitude[i + 1, j - 1], magnitude[i - 1, j + 1]
+            elif 67.5 <= angle[i, j] < 112.5:
+                q, r = magnitude[i + 1, j], magnitude[i - 1, j]
+            elif 112.5 <= angle[i, j] < 157.5:
+                q, r = magnitude[i - 1, j - 1], magnitude[i + 1, j + 1]
+
+            if magnitude[i, j] >= q and magnitude[i, j] >= r:
+                suppressed[i, j] = magnitude[i, j]
+
+    return suppressed
+
+
+def _test_image(seed: int, shape=(48, 40)) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 256, shape).astype(np.uint8)
+    # A bright disc adds edges in every direction
+    yy, xx = np.mgrid[: shape[0], : shape[1]]
+    image[(yy - shape[0] / 2) ** 2 + (xx - shape[1] / 2) ** 2 < (min(shape) / 3) ** 2] = 230
+    return image
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_nms_matches_reference_loop(seed):
+    smoothed = _gaussian_blur(_test_image(seed), sigma=1.4, kernel_size=5)
+    _, _, magnitude, direction = _compute_gradients(smoothed)
+
+    np.testing.assert_array_equal(
+        _non_maximum_suppression(magnitude, direction),
+        _reference_nms(magnitude, direction),
+    )
+
+
+def test_nms_on_axis_aligned_and_diagonal_angles():
+    rng = np.random.default_rng(0)
+    magnitude = rng.random((12, 12)).astype(np.float32) * 100
+    # Bin boundaries and exact multiples of 45 degrees, both signs
+    angles = np.array([0, 22.5, 45, 67.5, 90, 112.5, 135, 157.5, 180, -45, -90, -180])
+    direction = np.radians(np.resize(angles, magnitude.shape)).astype(np.float32)
+
+    np.testing.assert_array_equal(
+        _non_maximum_suppression(magnitude, direction),
+        _reference_nms(magnitude, direction),
+    )
+
+
+def test_nms_on_images_too_small_for_a_neighborhood():
+    magnitude = np.ones((2, 5), dtype=np.float32)
+    assert not _non_maximum_suppression(magnitude, np.zeros_like(magnitude)).any()
+
+
+def _reference_auto_threshold(magnitude: np.ndarray, low: float, high: float) -> tuple:
+    non_zero = magnitude[magnitude > 0]
+    if non_zero.size == 0:
+        return 100, 200
+    low_threshold, high_threshold = np.percentile(non_zero, [low, high])
+    if high_threshold <= low_threshold:
+        high_threshold = low_threshold * 2
+    return int(low_threshold), int(high_threshold)
+
+
+@pytest.mark.parametrize("percentiles", [(50, 85), (10, 90), (0, 100), (33.3, 66.7)])
+def test_auto_threshold_matches_np_percentile(percentiles):
+    smoothed = _gaussian_blur(_test_image(0), sigma=1.4, kernel_size=5)
+    _, _, magnitude, direction = _compute_gradients(smoothed)
+    suppressed = _non_maximum_suppression(magnitude, direction)
+
+    assert _auto_threshold(suppressed, *percentiles) == _reference_auto_threshold(
+        suppressed, *percentiles
+    )
+
+
+@pytest.mark.parametrize("values", [[], [5.0], [3.0, 3.0, 3.0]])
+def test_auto_threshold_degenerate_inputs(values):
+    magnitude = np.zeros(10, dtype=np.float32)
+    magnitude[: len(values)] = values
+
+    assert _auto_threshold(magnitude) == _reference_auto_threshold(magnitude, 50, 85)
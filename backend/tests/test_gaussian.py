@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from backend.src.filters.canny import _gaussian_kernel as _canny_kernel
+from backend.src.filters.gaussian import _convolve_separable, _generate_gaussian_kernel
+
+
+def _reference_convolve2d(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    # Direct 2D convolution over a reflect-padded copy, as before the split
+    pad_h, pad_w = kernel.shape[0] // 2, kernel.shape[1] // 2
+    padded = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode="reflect")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, kernel.shape)
+    return np.einsum("ijkl,kl->ij", windows, np.flip(kernel))
+
+
+@pytest.mark.parametrize("size, sigma", [(3, 0.8), (5, 1.0), (9, 2.0)])
+def test_separable_passes_match_2d_convolution(size, sigma):
+    rng = np.random.default_rng(size)
+    image = rng.integers(0, 256, (40, 33)).astype(np.float64)
+    kernel = _generate_gaussian_kernel(size, sigma)
+
+    result = _convolve_separable(image, kernel)
+
+    assert result.dtype == np.float64
+    np.testing.assert_allclose(
+        result, _reference_convolve2d(image, np.outer(kernel, kernel)), atol=1e-9
+    )
+
+
+def test_canny_float32_blur_matches_2d_convolution():
+    # Canny shares this implementation with float32 input and kernel
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (32, 32)).astype(np.float32)
+    kernel = _canny_kernel(5, 1.4)
+
+    result = _convolve_separable(image, kernel)
+    expected = _reference_convolve2d(image.astype(np.float64), np.outer(kernel, kernel))
+
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, atol=1e-3)
+
+
+def test_even_kernel_is_rejected():
+    with pytest.raises(ValueError):
+        _convolve_separable(np.zeros((8, 8)), np.ones(4) / 4)
@@ -0,0 +1,39 @@
+import asyncio
+
+from backend.src.api.middleware.logging import LoggingMiddleware
+
+
+def _scope(path: str = "/filter/apply") -> dict:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [],
+        "client": ("127.0.0.1", 5000),
+    }
+
+
+def test_request_without_a_response_is_still_logged():
+    async def app(scope, receive, send):
+        return
+
+    async def send(message):
+        raise AssertionError("nothing should be sent")
+
+    asyncio.run(LoggingMiddleware(app)(_scope(), None, send))
+
+
+def test_response_carries_processing_time_header():
+    messages = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(LoggingMiddleware(app)(_scope(), None, send))
+
+    headers = dict(messages[0]["headers"])
+    assert float(headers[b"x-process-time-ms"]) >= 0
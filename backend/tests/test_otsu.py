@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from backend.src.filters.otsu import apply_otsu
+
+
+def _reference_threshold(image: np.ndarray) -> int:
+    # The original per-threshold loop over normalized histogram weights
+    prob = np.bincount(image.ravel(), minlength=256) / image.size
+
+    optimal_threshold, max_variance = 0, 0.0
+    cumsum_0, cumsum_1 = 0.0, np.sum(np.arange(256) * prob)
+    weight_0, weight_1 = 0.0, 1.0
+    for threshold in range(256):
+        weight_0 += prob[threshold]
+        weight_1 -= prob[threshold]
+        if weight_0 == 0 or weight_1 == 0:
+            continue
+
+        cumsum_0 += threshold * prob[threshold]
+        cumsum_1 -= threshold * prob[threshold]
+        mean_0, mean_1 = cumsum_0 / weight_0, cumsum_1 / weight_1
+
+        variance = weight_0 * weight_1 * (mean_0 - mean_1) ** 2
+        if variance > max_variance:
+            optimal_threshold, max_variance = threshold, variance
+
+    return optimal_threshold
+
+
+def _bimodal(rng, shape=(128, 96)) -> np.ndarray:
+    dark = rng.normal(60, 15, shape)
+    bright = rng.normal(180, 25, shape)
+    return np.clip(np.where(rng.random(shape) < 0.4, dark, bright), 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference_loop(seed):
+    rng = np.random.default_rng(seed)
+    for image in (_bimodal(rng), rng.integers(0, 256, (64, 80), dtype=np.uint8)):
+        expected = np.where(image > _reference_threshold(image), 255, 0).astype(np.uint8)
+        np.testing.assert_array_equal(apply_otsu(image), expected)
+
+
+def test_constant_image_falls_back_to_threshold_zero():
+    # Every threshold leaves one class empty, so none is selected (like the loop)
+    result = apply_otsu(np.full((16, 16), 77, dtype=np.uint8))
+
+    assert result.dtype == np.uint8
+    assert (result == 255).all()
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.src.config.settings import YOLO_INPUT_SIZE
+from backend.src.models.yolo_detector import YOLODetector
+from backend.src.utils.preprocessing import _rgb_to_gray_uint8, letterbox
+
+
+class FakeBoxes:
+    """The slice of an Ultralytics `Boxes` object that `_parse_result` reads."""
+
+    def __init__(self, data: np.ndarray):
+        self.data = SimpleNamespace(cpu=lambda: SimpleNamespace(numpy=lambda: data))
+
+    def __len__(self) -> int:
+        return len(self.data.cpu().numpy())
+
+
+@pytest.mark.parametrize("shape", [(600, 1000), (1000, 600), (333, 333), (2048, 1536)])
+def test_letterbox_places_scaled_image_at_reported_offset(shape):
+    image = np.full(shape, 255, dtype=np.uint8)
+    boxed, ratio, (left, top) = letterbox(image, 640)
+
+    assert boxed.shape == (640, 640)
+    rows, cols = np.nonzero(boxed == 255)
+    assert (rows.min(), cols.min()) == (top, left)
+    assert rows.max() - rows.min() + 1 == round(shape[0] * ratio)
+    assert cols.max() - cols.min() + 1 == round(shape[1] * ratio)
+    assert np.count_nonzero(boxed == 114) == boxed.size - rows.size
+
+
+@pytest.mark.parametrize("shape", [(600, 1000), (1200, 900)])
+def test_detections_map_back_to_original_pixels(tmp_path, shape):
+    detector = YOLODetector(model_path=tmp_path / "unused.pt")
+    detector.model = SimpleNamespace(names={0: "Aortic enlargement", 1: "Cardiomegaly"})
+
+    rng = np.random.default_rng(0)
+    yolo_input = detector.preprocess(rng.integers(0, 256, shape, dtype=np.uint8))
+    assert yolo_input["tensor"].shape == (1, 1, YOLO_INPUT_SIZE, YOLO_INPUT_SIZE)
+
+    # Boxes in original pixels, pushed through the letterbox transform the way
+    # the model would report them
+    original = np.array([[100, 50, 400, 300], [0, 0, shape[1], shape[0]]], dtype=np.float32)
+    pad_left, pad_top = yolo_input["pad"]
+    model_xyxy = original * yolo_input["ratio"] + (pad_left, pad_top, pad_left, pad_top)
+    data = np.hstack([model_xyxy, [[0.9, 1], [0.5, 0]]]).astype(np.float32)
+
+    detections = detector._parse_result(SimpleNamespace(boxes=FakeBoxes(data)), yolo_input)
+
+    assert [d["class_name_en"] for d in detections] == ["Cardiomegaly", "Aortic enlargement"]
+    for detection, expected in zip(detections, original):
+        bbox = detection["bbox"]
+        mapped = [bbox["x1"], bbox["y1"], bbox["x2"], bbox["y2"]]
+        np.testing.assert_allclose(mapped, expected, atol=1)
+
+
+def test_boxes_outside_the_image_are_clipped(tmp_path):
+    detector = YOLODetector(model_path=tmp_path / "unused.pt")
+    detector.model = SimpleNamespace(names={0: "Aortic enlargement"})
+    yolo_input = detector.preprocess(np.zeros((600, 1000), dtype=np.uint8))
+
+    # A box reaching into the padding on every side
+    size = YOLO_INPUT_SIZE
+    data = np.array([[-5, 0, size + 5, size, 0.8, 0]], dtype=np.float32)
+
+    (detection,) = detector._parse_result(SimpleNamespace(boxes=FakeBoxes(data)), yolo_input)
+    assert detection["bbox"] == {"x1": 0, "y1": 0, "x2": 1000, "y2": 600}
+
+
+def test_fixed_point_gray_matches_float_luma():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (64, 48, 3), dtype=np.uint8)
+    image[0, 0] = 255
+
+    gray = _rgb_to_gray_uint8(image)
+    expected = np.dot(image, [0.299, 0.587, 0.114]).astype(np.uint8)
+
+    assert gray.dtype == np.uint8
+    assert gray[0, 0] == 255
+    assert np.abs(gray.astype(np.int16) - expected).max() <= 1
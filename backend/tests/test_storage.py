@@ -0,0 +1,112 @@
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+from backend.src.utils import storage as storage_module
+from backend.src.utils.storage import SharedImageStore
+
+
+@pytest.fixture
+def make_store(monkeypatch, clock, tmp_path):
+    monkeypatch.setattr(storage_module, "time", clock)
+    stores = []
+
+    def make(maxsize: int = 3, ttl: float = 10) -> SharedImageStore:
+        store = SharedImageStore(tmp_path / "index.sqlite3", maxsize=maxsize, ttl=ttl)
+        stores.append(store)
+        return store
+
+    yield make
+
+    for store in stores:
+        store._db.close()
+
+
+def _array_rows(store: SharedImageStore) -> int:
+    return store._db.execute("SELECT COUNT(*) FROM arrays").fetchone()[0]
+
+
+def test_roundtrip_keeps_fields_and_nested_arrays(make_store):
+    store = make_store()
+    image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    store["a"] = {"image": image, "meta": {"mask": image > 5, "name": "a.png"}}
+
+    value = store["a"]
+    np.testing.assert_array_equal(value["image"], image)
+    np.testing.assert_array_equal(value["meta"]["mask"], image > 5)
+    assert value["meta"]["name"] == "a.png"
+    assert not value["image"].flags.writeable
+
+
+def test_entries_are_visible_to_other_workers(make_store):
+    writer, reader = make_store(), make_store()
+    writer["a"] = {"image": np.full((2, 2), 7, dtype=np.uint8)}
+
+    np.testing.assert_array_equal(reader["a"]["image"], 7)
+
+
+def test_entry_expires_after_ttl_and_frees_its_arrays(make_store, clock):
+    store = make_store()
+    store["a"] = {"image": np.zeros((4, 4), dtype=np.uint8)}
+    assert _array_rows(store) == 1
+
+    clock.advance(9)
+    assert "a" in store
+    assert store.get("a") is not None
+
+    # get() refreshed the entry, so it lives for another full ttl
+    clock.advance(9)
+    assert "a" in store
+
+    clock.advance(10)
+    assert "a" not in store
+    store.expire()
+    assert store.get("a") is None
+    assert _array_rows(store) == 0
+
+
+def test_least_recently_used_entry_is_evicted(make_store, clock):
+    store = make_store(maxsize=2)
+    store["a"] = {"image": np.zeros(1, dtype=np.uint8)}
+    clock.advance(1)
+    store["b"] = {"image": np.zeros(1, dtype=np.uint8)}
+    clock.advance(1)
+    store.get("a")
+    clock.advance(1)
+    store["c"] = {"image": np.zeros(1, dtype=np.uint8)}
+
+    assert "b" not in store
+    assert "a" in store and "c" in store
+    assert _array_rows(store) == 2
+
+
+def test_non_contiguous_arrays_round_trip(make_store):
+    store = make_store()
+    image = np.arange(48, dtype=np.uint16).reshape(6, 8)[::2, 1::3]
+    store["a"] = {"image": image}
+
+    np.testing.assert_array_equal(store["a"]["image"], image)
+
+
+def test_stored_entries_hold_no_file_descriptors(make_store):
+    store = make_store(maxsize=500)
+    fds_before = len(os.listdir("/proc/self/fd"))
+    for i in range(300):
+        store[str(i)] = {"image": np.full((8, 8), i % 256, dtype=np.uint8)}
+        store.get(str(i))
+
+    assert len(store) == 300
+    assert len(os.listdir("/proc/self/fd")) <= fds_before + 2
+
+
+def test_database_from_an_older_layout_is_recreated(make_store, tmp_path):
+    db = sqlite3.connect(tmp_path / "index.sqlite3")
+    db.execute("CREATE TABLE entries (key TEXT, fields BLOB, arrays BLOB, expires_at REAL)")
+    db.commit()
+    db.close()
+
+    store = make_store()
+    store["a"] = {"image": np.ones(3, dtype=np.uint8)}
+    np.testing.assert_array_equal(store["a"]["image"], 1)
@@ -0,0 +1,105 @@
+import asyncio
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+from backend.src.api.main import app
+from backend.src.api.middleware.validation import RequestSizeLimitMiddleware, read_bounded
+from backend.src.api.routes import filters
+from backend.src.config.settings import MAX_REQUEST_SIZE_BYTES, UPLOAD_CHUNK_SIZE_BYTES
+
+
+class CountingBytesIO(io.BytesIO):
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=CountingBytesIO(data), filename="a.png")
+
+
+def test_reads_whole_file_up_to_the_limit():
+    data = bytes(range(256)) * 1000
+    assert asyncio.run(read_bounded(_upload(data), limit=len(data))) == data
+
+
+def test_empty_file():
+    assert asyncio.run(read_bounded(_upload(b""), limit=10)) == b""
+
+
+def test_rejects_one_byte_over_the_limit():
+    with pytest.raises(ValueError):
+        asyncio.run(read_bounded(_upload(b"x" * 11), limit=10))
+
+
+def test_stops_reading_once_the_limit_is_exceeded():
+    limit = UPLOAD_CHUNK_SIZE_BYTES * 2
+    upload = _upload(b"x" * (limit * 10))
+
+    with pytest.raises(ValueError):
+        asyncio.run(read_bounded(upload, limit=limit))
+    assert upload.file.bytes_read <= limit + UPLOAD_CHUNK_SIZE_BYTES
+
+
+def test_upload_route_answers_413_for_oversized_files(monkeypatch):
+    monkeypatch.setattr(filters, "MAX_FILE_SIZE_BYTES", 100)
+    response = TestClient(app).post(
+        "/upload", files={"file": ("a.png", b"x" * 101, "image/png")}
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error"] == "FILE_TOO_LARGE"
+
+
+def test_oversized_content_length_is_rejected_before_the_body_is_read():
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(scope["path"])
+
+    messages = []
+
+    async def receive():
+        raise AssertionError("the body must not be read")
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "headers": [(b"content-length", str(MAX_REQUEST_SIZE_BYTES + 1).encode())],
+    }
+    asyncio.run(RequestSizeLimitMiddleware(app)(scope, receive, send))
+
+    assert received == []
+    assert messages[0]["status"] == 413
+    assert json.loads(messages[1]["body"])["detail"]["error"] == "FILE_TOO_LARGE"
+
+
+def test_upload_with_oversized_content_length_gets_413():
+    body = b"x" * (MAX_REQUEST_SIZE_BYTES + 1)
+    response = TestClient(app).post(
+        "/upload",
+        content=body,
+        headers={"Content-Type": "multipart/form-data; boundary=x"},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["details"]["max_bytes"] == MAX_REQUEST_SIZE_BYTES
+
+
+def test_requests_within_the_limit_pass_through():
+    response = TestClient(app).get("/health")
+    assert response.status_code == 200
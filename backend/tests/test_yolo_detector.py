@@ -0,0 +1,58 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.src.config.settings import YOLO_MAX_BATCH_SIZE
+from backend.src.models.yolo_detector import YOLODetector, _engine_max_batch_size
+
+
+def _write_engine(path, metadata) -> None:
+    meta = json.dumps(metadata).encode("utf-8")
+    path.write_bytes(len(meta).to_bytes(4, byteorder="little") + meta + b"\x00serialized")
+
+
+@pytest.mark.parametrize(
+    "metadata, expected",
+    [
+        ({"batch": 8, "args": {"dynamic": True, "batch": 8}}, min(8, YOLO_MAX_BATCH_SIZE)),
+        ({"batch": 4, "args": {"dynamic": True, "batch": 4}}, min(4, YOLO_MAX_BATCH_SIZE)),
+        # Static exports only run the batch they were built for
+        ({"batch": 1, "args": {"dynamic": False, "batch": 1}}, 1),
+        ({"batch": 1, "imgsz": [640, 640]}, 1),
+    ],
+)
+def test_engine_max_batch_size_comes_from_export_metadata(tmp_path, metadata, expected):
+    engine = tmp_path / "model.engine"
+    _write_engine(engine, metadata)
+
+    assert _engine_max_batch_size(engine) == expected
+
+
+def test_engine_without_metadata_is_treated_as_batch_one(tmp_path):
+    engine = tmp_path / "model.engine"
+    engine.write_bytes(b"\xff\xfe\xfd\xfc" + bytes(range(256)))
+
+    assert _engine_max_batch_size(engine) == 1
+
+
+def test_predict_batch_falls_back_to_single_images_on_a_batch_error():
+    detector = YOLODetector()
+    detector.model_loaded = True
+    detector.max_batch_size = 4
+    batch_sizes = []
+
+    def run_model(chunk):
+        batch_sizes.append(len(chunk))
+        if len(chunk) > 1:
+            raise RuntimeError("input shape (3, 3, 640, 640) exceeds the engine profile")
+        # No boxes: nothing to parse
+        return [SimpleNamespace(boxes=[])]
+
+    detector._run_model = run_model
+    image = np.zeros((64, 64), dtype=np.uint8)
+
+    assert detector.predict_batch([image] * 3) == [[], [], []]
+    assert batch_sizes == [3, 1, 1, 1]
+    assert detector.max_batch_size == 1
@@ -4,12 +4,18 @@ from io import BytesIO
 from PIL import Image
 from typing import List, Dict, Any, Optional
 
+from utils.api_client import APIError, apply_filters, format_api_error
+
 
 def decode_base64_image(base64_string: str) -> Image.Image:
     image_bytes = base64.b64decode(base64_string)
     return Image.open(BytesIO(image_bytes))
 
 
+def decode_image_bytes(image_bytes: bytes) -> Image.Image:
+    return Image.open(BytesIO(image_bytes))
+
+
 def create_download_link(base64_string: str, filename: str) -> str:
     href = f"data:image/png;base64,{base64_string}"
     return f'<a href="{href}" download="{filename}">📥 Tải xuống {filename}</a>'
@@ -42,10 +48,15 @@ def render_processed_results(results: List[Dict[str, Any]], total_time_ms: int):
                     render_single_result(result, result_idx + 1)
 
 
+def _file_extension(media_type: str) -> str:
+    return "jpg" if media_type == "image/jpeg" else "png"
+
+
 def render_single_result(result: Dict[str, Any], result_number: int):
     filter_name = result["filter_name"]
     display_name = result["display_name"]
-    image_base64 = result["image_base64"]
+    image_bytes = result["image_bytes"]
+    media_type = result.get("media_type", "image/png")
     processing_time_ms = result["processing_time_ms"]
 
     # Create container for this result
@@ -58,7 +69,7 @@ def render_single_result(result: Dict[str, Any], result_number: int):
 
         # Decode and display image
         try:
-            processed_image = decode_base64_image(image_base64)
+            processed_image = decode_image_bytes(image_bytes)
 
             # Display thumbnail
             st.image(processed_image, width="stretch")
@@ -94,13 +105,14 @@ def render_single_result(result: Dict[str, Any], result_number: int):
                 st.image(processed_image, width="stretch")
                 st.markdown("</div>", unsafe_allow_html=True)
 
-            # Download button
-            download_filename = f"{filter_name}_processed.png"
+            # Download button (the displayed preview; full resolution is in the ZIP)
+            download_filename = f"{filter_name}_preview.{_file_extension(media_type)}"
             st.download_button(
-                label=f"📥 Tải xuống",
-                data=base64.b64decode(image_base64),
+                label="📥 Tải xuống (bản xem trước)",
+                help="Ảnh xem trước đã thu nhỏ. Tải ZIP để nhận ảnh độ phân giải gốc.",
+                data=image_bytes,
                 file_name=download_filename,
-                mime="image/png",
+                mime=media_type,
                 key=f"download_{filter_name}_{result_number}",
                 width="stretch",
             )
@@ -131,26 +143,37 @@ def render_side_by_side_comparison(
         st.image(processed_image, width="stretch")
 
 
-def render_download_all_button(results: List[Dict[str, Any]], original_filename: str):
+def render_download_all_button(
+    results: List[Dict[str, Any]], original_filename: str, image_id: str
+):
     import zipfile
     from io import BytesIO
 
     st.markdown("### 📦 Tải Xuống Tất Cả")
 
     if st.button("📥 Tải xuống tất cả ảnh đã xử lý (ZIP)", width="stretch"):
+        # Displayed results are downscaled previews; re-run the filters for
+        # lossless full-resolution files
+        filter_names = [result["filter_name"] for result in results]
+        try:
+            with st.spinner("⚙️ Đang tạo ảnh độ phân giải gốc..."):
+                response = apply_filters(image_id, filter_names, full_resolution=True)
+        except APIError as e:
+            st.error(format_api_error(e))
+            return
+        results = response["results"]
+
         # Create ZIP file in memory
         zip_buffer = BytesIO()
 
         with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
             for result in results:
                 filter_name = result["filter_name"]
-                image_base64 = result["image_base64"]
-
-                # Decode image
-                image_bytes = base64.b64decode(image_base64)
+                image_bytes = result["image_bytes"]
+                extension = _file_extension(result.get("media_type", "image/png"))
 
                 # Add to ZIP
-                filename = f"{filter_name}_{original_filename}.png"
+                filename = f"{filter_name}_{original_filename}.{extension}"
                 zip_file.writestr(filename, image_bytes)
 
         # Provide download
@@ -205,6 +228,7 @@ def render_performance_summary(results: List[Dict[str, Any]], total_time_ms: int
 
 __all__ = [
     "decode_base64_image",
+    "decode_image_bytes",
     "create_download_link",
     "render_original_image",
     "render_processed_results",
@@ -1,5 +1,4 @@
 import streamlit as st
-import base64
 from io import BytesIO
 from PIL import Image
 import sys
@@ -198,7 +197,7 @@ def render_detection_page():
         result = st.session_state.detection_result
         is_normal = result.get("is_normal", False)
         detections = result.get("detections", [])
-        annotated_image_b64 = result.get("annotated_image", "")
+        annotated_image_bytes = result.get("annotated_image", b"")
         processing_time_ms = result.get("processing_time_ms", 0)
 
         # Display result summary
@@ -230,11 +229,9 @@ def render_detection_page():
 
         else:
             # Display annotated image
-            if annotated_image_b64:
+            if annotated_image_bytes:
                 try:
-                    # Decode base64 image
-                    image_bytes = base64.b64decode(annotated_image_b64)
-                    annotated_image = Image.open(BytesIO(image_bytes))
+                    annotated_image = Image.open(BytesIO(annotated_image_bytes))
 
                     # Display annotated image
                     st.markdown("#### Ảnh đã phân tích:")
@@ -237,8 +237,10 @@ def render_filter_processing_page():
 
         st.markdown("---")
 
-        if len(results) > 1:
-            render_download_all_button(results, st.session_state.uploaded_filename)
+        # Also the only way to get full-resolution files for a single filter
+        render_download_all_button(
+            results, st.session_state.uploaded_filename, st.session_state.image_id
+        )
 
         # Reset button
         st.markdown("---")
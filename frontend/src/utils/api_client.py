@@ -5,6 +5,7 @@ This module provides functions to call backend endpoints from the Streamlit fron
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
 import io
 
@@ -51,6 +52,14 @@ def upload_image(image_bytes: bytes, filename: str) -> Dict[str, Any]:
 
         response = requests.post(f"{API_BASE_URL}/upload", files=files, timeout=30)
 
+        # The backend answers 413 for oversized files; a reverse proxy may
+        # answer it too, without a JSON body
+        if response.status_code == 413:
+            raise APIError(
+                "Tải ảnh thất bại: Kích thước tệp vượt quá giới hạn cho phép. "
+                "Vui lòng chọn ảnh nhỏ hơn."
+            )
+
         if response.status_code != 200:
             error_detail = response.json().get("detail", {})
             if isinstance(error_detail, dict):
@@ -65,6 +74,38 @@ def upload_image(image_bytes: bytes, filename: str) -> Dict[str, Any]:
         raise APIError(f"Không thể kết nối tới máy chủ: {str(e)}")
 
 
+def fetch_result_image(image_url: str) -> bytes:
+    """
+    Download a processed result image from the backend.
+
+    Args:
+        image_url: Relative URL returned by the backend (e.g. /filter/result/...)
+
+    Returns:
+        Raw encoded image bytes
+
+    Raises:
+        APIError: If the image cannot be fetched
+    """
+    try:
+        response = requests.get(f"{API_BASE_URL}{image_url}", timeout=30)
+
+        if response.status_code != 200:
+            error_detail = response.json().get("detail", {})
+            if isinstance(error_detail, dict):
+                message = error_detail.get("message") or error_detail.get(
+                    "error", "Unknown error"
+                )
+            else:
+                message = str(error_detail)
+            raise APIError(f"Không thể tải ảnh kết quả: {message}")
+
+        return response.content
+
+    except requests.exceptions.RequestException as e:
+        raise APIError(f"Không thể kết nối tới máy chủ: {str(e)}")
+
+
 def get_available_filters() -> List[Dict[str, str]]:
     """
     Get list of available image filters from backend.
@@ -92,22 +133,31 @@ def get_available_filters() -> List[Dict[str, str]]:
         raise APIError(f"Không thể kết nối tới máy chủ: {str(e)}")
 
 
-def apply_filters(image_id: str, filter_names: List[str]) -> Dict[str, Any]:
+def apply_filters(
+    image_id: str,
+    filter_names: List[str],
+    full_resolution: bool = False,
+) -> Dict[str, Any]:
     """
     Apply one or more filters to an uploaded image.
 
     Args:
         image_id: ID of uploaded image
         filter_names: List of filter names to apply
+        full_resolution: Request lossless PNG outputs at the original size
+            instead of the downscaled JPEG previews used for display
 
     Returns:
-        Dictionary with processed images (base64 encoded) and timing info
+        Dictionary with processed images (encoded bytes in ``image_bytes``,
+        format given by ``media_type``) and timing info
 
     Raises:
         APIError: If processing fails
     """
     try:
         payload = {"image_id": image_id, "filters": filter_names}
+        if full_resolution:
+            payload.update({"display_max_side": None, "format": "png"})
 
         response = requests.post(
             f"{API_BASE_URL}/filter/apply",
@@ -123,7 +173,18 @@ def apply_filters(image_id: str, filter_names: List[str]) -> Dict[str, Any]:
                 message = str(error_detail)
             raise APIError(f"Xử lý bộ lọc thất bại: {message}")
 
-        return response.json()
+        # Download the result images in parallel rather than one after another
+        data = response.json()
+        results = data["results"]
+        if results:
+            with ThreadPoolExecutor(max_workers=len(results)) as executor:
+                images = executor.map(
+                    fetch_result_image, [result["image_url"] for result in results]
+                )
+                for result, image_bytes in zip(results, images):
+                    result["image_bytes"] = image_bytes
+
+        return data
 
     except requests.exceptions.Timeout:
         raise APIError("Quá thời gian xử lý. Vui lòng thử lại với ít bộ lọc hơn.")
@@ -188,7 +249,7 @@ def analyze_image_for_detection(
             - confidence_tier: str (high/medium/low)
             - bbox: [x1, y1, x2, y2]
             - health_info: dict (Vietnamese description, causes, symptoms, treatment)
-        - annotated_image: str (base64 encoded PNG)
+        - annotated_image: bytes (raw JPEG bytes)
         - processing_time_ms: int
 
     Raises:
@@ -203,11 +264,17 @@ def analyze_image_for_detection(
 
         if response.status_code == 200:
             data = response.json()
+            annotated_image = b""
+            if data.get("annotated_image_url"):
+                try:
+                    annotated_image = fetch_result_image(data["annotated_image_url"])
+                except APIError as e:
+                    return {"success": False, "error": str(e)}
             return {
                 "success": True,
                 "is_normal": data.get("is_normal", False),
                 "detections": data.get("detections", []),
-                "annotated_image": data.get("annotated_image", ""),
+                "annotated_image": annotated_image,
                 "processing_time_ms": data.get("processing_time_ms", 0),
             }
         else:
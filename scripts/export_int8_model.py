@@ -0,0 +1,12 @@
+import sys
+from pathlib import Path
+
+from backend.src.models.yolo_detector import export_int8_model
+
+# One-time INT8 export of the production weights, calibrated on a YOLO
+# dataset (path to its data.yaml): TensorRT on NVIDIA GPUs, OpenVINO on CPU.
+# The backend uses it on next start when YOLO_PRECISION=int8.
+if len(sys.argv) != 2:
+    sys.exit("Usage: python -m scripts.export_int8_model <path/to/data.yaml>")
+
+export_int8_model(Path(sys.argv[1]))
@@ -0,0 +1,6 @@
+from backend.src.models.yolo_detector import export_tensorrt_engine
+
+# One-time export of the production weights to a TensorRT FP16 engine.
+# Requires an NVIDIA GPU with TensorRT; the backend picks the engine up
+# automatically from MODEL_ENGINE_PATH on next start.
+export_tensorrt_engine()
@@ -0,0 +1,6 @@
+from backend.src.models.yolo_detector import export_torchscript_model
+
+# One-time export of the production weights to TorchScript. Works without
+# TensorRT (CPU or GPU); the backend picks the model up automatically from
+# MODEL_TORCHSCRIPT_PATH on next start when no TensorRT engine is present.
+export_torchscript_model()